@@ -1,110 +1,40 @@
 # !pip install faster-whisper==1.1.1
 # !pip install ctranslate2==4.6.0
 import os
-import gc
-import time
-import requests
-import torch
-from tqdm.auto import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from faster_whisper import WhisperModel
+import re
+import numpy as np
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from faster_whisper import BatchedInferencePipeline
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import TranscriptionOptions, get_suppressed_tokens
+from faster_whisper.vad import VadOptions, collect_chunks, get_speech_timestamps, merge_segments
+import downloader
+from audio_decode import iter_pcm, load_pcm
+import transcript_cache
+from model_pool import model_options, pool
 
 MODEL_REPO = "deepdml/faster-whisper-large-v3-turbo-ct2"
 MODEL_DIR  = "./faster-whisper-large-v3-turbo-ct2"
+BATCH_SIZE   = 8                                 # speech chunks (≤30 s each) decoded together
+PREP_WORKERS = min(4, os.cpu_count() or 1)       # threads decoding + VAD-splitting files
+LONG_CHUNK   = 120.0                             # s of audio per parallel long-form chunk
+LONG_WORKERS = min(4, os.cpu_count() or 1)       # CTranslate2 replicas for long-form on CPU
+LANG_SECONDS = 30.0                              # s of speech language ID looks at (one window)
+LANG_SCAN    = 90.0                              # s decoded from the start of a file to find it
 
 
 # ── downloader ────────────────────────────────────────────────────────────────
 
-def _expected_size(url):
-    try:
-        r = requests.head(url, allow_redirects=True, timeout=10)
-        return int(r.headers.get("content-length", -1))
-    except Exception:
-        return -1
-
-def _download_file(url, path, redownload=False):
-    parent = os.path.dirname(path)
-    if parent:
-        os.makedirs(parent, exist_ok=True)
-
-    if not redownload and os.path.exists(path):
-        local_size = os.path.getsize(path)
-        if local_size > 0:
-            remote_size = _expected_size(url)
-            if remote_size == -1 or local_size == remote_size:
-                return "SKIPPED", f"✔️ Skipped: {os.path.basename(path)}"
-
-    try:
-        with requests.get(url, stream=True, timeout=60) as r:
-            r.raise_for_status()
-            total = int(r.headers.get("content-length", 0))
-            with open(path, "wb") as f, tqdm(
-                total=total, unit="B", unit_scale=True,
-                desc=os.path.basename(path), leave=False,
-            ) as pbar:
-                for chunk in r.iter_content(chunk_size=1024 * 64):
-                    if chunk:
-                        f.write(chunk)
-                        pbar.update(len(chunk))
-        return "DOWNLOADED", f"⬇️ Downloaded: {os.path.basename(path)}"
-    except Exception as e:
-        if os.path.exists(path):
-            try: os.remove(path)
-            except Exception: pass
-        return "FAILED", f"❌ Failed: {os.path.basename(path)} ({e})"
-
-def download_model(repo_id, download_folder="./", redownload=False, workers=6):
-    start = time.time()
-    download_dir = os.path.abspath(download_folder)
-    os.makedirs(download_dir, exist_ok=True)
-    print(f"📂 {download_dir}")
-
-    # ── parallel download (primary) ──────────────────────────────────────────
-    try:
-        response = requests.get(f"https://huggingface.co/api/models/{repo_id}", timeout=30)
-        response.raise_for_status()
-        files = [f["rfilename"] for f in response.json().get("siblings", [])]
-        print(f"🚀 Parallel download | {len(files)} files | workers={workers}")
-
-        skipped = downloaded = failed = 0
-        with ThreadPoolExecutor(max_workers=workers) as ex:
-            futures = {
-                ex.submit(
-                    _download_file,
-                    f"https://huggingface.co/{repo_id}/resolve/main/{file}",
-                    os.path.join(download_dir, file),
-                    redownload,
-                ): file for file in files
-            }
-            for future in tqdm(as_completed(futures), total=len(futures), desc="Overall"):
-                status, msg = future.result()
-                if status == "SKIPPED":      skipped += 1
-                elif status == "DOWNLOADED": downloaded += 1; print(msg)
-                else:                        failed += 1;     print(msg)
-
-        print(f"📊 {downloaded} downloaded | {skipped} skipped | {failed} failed")
-        if failed == 0:
-            print(f"✅ Done  ⏱ {time.time()-start:.1f}s")
-            return download_dir
-        print(f"⚠️ {failed} files failed → falling back to snapshot_download")
-    except Exception as e:
-        print(f"⚠️ Parallel download error ({e}) → falling back to snapshot_download")
-
-    # ── snapshot fallback ─────────────────────────────────────────────────────
-    try:
-        from huggingface_hub import snapshot_download
-        print("🚀 snapshot_download (fallback)...")
-        snapshot_download(
-            repo_id=repo_id,
-            local_dir=download_dir,
-            local_dir_use_symlinks=False,
-            resume_download=not redownload,
-        )
-        print(f"✅ Done  ⏱ {time.time()-start:.1f}s")
-        return download_dir
-    except Exception as e:
-        print(f"❌ snapshot_download also failed: {e}")
-        return None
+def download_model(repo_id, download_folder="./", redownload=False, workers=6, connections=8,
+                   use_cache=True, allow_patterns=None, ignore_patterns=None, prefer_safetensors=True):
+    # parallel download first, snapshot_download if a file fails (see downloader.download_model)
+    return downloader.download_model(
+        repo_id, download_folder, redownload, workers, connections,
+        use_cache=use_cache, allow_patterns=allow_patterns, ignore_patterns=ignore_patterns,
+        prefer_safetensors=prefer_safetensors,
+    )
 
 LANGUAGE_CODE = {
     'Auto': None,
@@ -128,60 +58,431 @@ LANGUAGE_CODE = {
 }
 CODE_TO_NAME = {v: k for k, v in LANGUAGE_CODE.items() if v}
 
-# ── model singleton ───────────────────────────────────────────────────────────
-
-_model = None
+# ── model pool ────────────────────────────────────────────────────────────────
 
-def load_model():
-    global _model
-    if _model is not None:
-        return _model
+_model_path = None
 
-    device       = "cuda" if torch.cuda.is_available() else "cpu"
-    compute_type = "float16" if torch.cuda.is_available() else "int8"
+def _resolve_model():
+    global _model_path
+    if _model_path is None:
+        # warm start: validated against the cached manifest, at most one request
+        model_path = download_model(MODEL_REPO, download_folder=MODEL_DIR, redownload=False)
+        if model_path is None and os.path.isdir(MODEL_DIR):
+            model_path = MODEL_DIR
+        _model_path = model_path
+    return _model_path
 
-    model_path = MODEL_DIR if os.path.isdir(MODEL_DIR) else \
-                 download_model(MODEL_REPO, download_folder="./", redownload=False)
+def load_model(objective="latency", **kwargs):
+    """
+    The resident model from model_pool (loaded on first use); give it back
+    with release_model(). objective picks the whisper_tune winner: "latency"
+    for one file at a time, "throughput" for batches. kwargs (cpu_threads,
+    num_workers, ...) go to WhisperModel and select a separate pooled instance.
+    """
+    model_path, device, compute_type, options = _model_args(objective)
+    return pool.acquire(model_path, device, compute_type, **{**options, **kwargs})
 
-    _model = WhisperModel(model_path, device=device, compute_type=compute_type)
-    return _model
+def _model_args(objective):
+    model_path = _resolve_model()
+    device, compute_type, options = model_options(model_path, objective)   # tuned if benchmarked
+    return model_path, device, compute_type, options
 
+def release_model(model):
+    pool.release(model)
 
 def unload_model():
-    global _model
-    _model = None
-    gc.collect()
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
+    """Free every model not in use right now instead of waiting for the idle timeout."""
+    pool.evict_idle(0)
 
 # ── main function ─────────────────────────────────────────────────────────────
 
-def get_transcript(audio_path: str, language: str = "Auto") -> tuple[str, str]:
+def _cached(audio_path, transcribe, language, options, index=True, objective="latency"):
+    # transcript_cache.cached keyed on this module's model (asr_server uses it too)
+    _, compute_type, _ = model_options(MODEL_DIR, objective)
+    return transcript_cache.cached(audio_path, transcribe, MODEL_REPO, compute_type, language,
+                                   options, index)
+
+def _transcript(audio_path, language, use_cache, word_timestamps):
+    def transcribe(audio):
+        segments, detected_name = stream_transcript(audio, language, word_timestamps)
+        segments = list(segments)
+        return {"text": " ".join(s.text for s in segments), "language": detected_name,
+                "segments": [s._asdict() for s in segments]}
+
+    if not use_cache:
+        return transcribe(audio_path)
+    return _cached(audio_path, transcribe, language, {"word_timestamps": word_timestamps})
+
+def get_transcript(audio_path: str, language: str = "Auto", use_cache: bool = True) -> tuple[str, str]:
     """
     Transcribe audio and return (transcript_text, detected_language_name).
 
     Args:
         audio_path : path to audio/video file
         language   : language name from LANGUAGE_CODE keys, or "Auto"
+        use_cache  : reuse the stored transcript of the same audio (see transcript_cache)
 
     Returns:
         (transcript_text, language_name)
         e.g. ("Hello world ...", "English")
     """
-    model    = load_model()
+    result = _transcript(audio_path, language, use_cache, False)
+    return result["text"], result["language"]
+
+def get_timed_transcript(audio_path: str, language: str = "Auto",
+                         use_cache: bool = True) -> tuple[list, str]:
+    """
+    Like get_transcript, with timings: (segments, language_name), where each
+    TranscriptSegment carries `words`, [(word, start, end, probability), ...]
+    from the same decode. subtitles.py turns them into SRT / WebVTT cues.
+    """
+    result = _transcript(audio_path, language, use_cache, True)
+    segments = [TranscriptSegment(**{**s, "words": [tuple(w) for w in s.get("words") or ()]})
+                for s in result["segments"]]                 # JSON from the cache has lists
+    return segments, result["language"]
+
+
+# ── streaming ─────────────────────────────────────────────────────────────────
+
+TranscriptSegment = namedtuple("TranscriptSegment", "text start end avg_logprob words", defaults=(None,))
+
+class SegmentStream:
+    """
+    Iterator of TranscriptSegment, decoded one at a time as it is consumed.
+    Holds the pooled model until it is exhausted, closed or garbage-collected.
+    """
+
+    def __init__(self, model, segments):
+        self._model    = model
+        self._segments = segments
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._model is None:
+            raise StopIteration
+        try:
+            s = next(self._segments)
+        except BaseException:                        # StopIteration included
+            self.close()
+            raise
+        words = [(w.word, w.start, w.end, w.probability) for w in s.words] if s.words else None
+        return TranscriptSegment(s.text.strip(), s.start, s.end, s.avg_logprob, words)
+
+    def close(self):
+        if self._model is not None:
+            model, self._model = self._model, None
+            release_model(model)
+
+    __del__ = close
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def stream_transcript(audio_path: str, language: str = "Auto",
+                      word_timestamps: bool = False) -> tuple[SegmentStream, str]:
+    """
+    Like get_transcript, but returns (segments, language_name) right after
+    language detection; `segments` yields TranscriptSegment(text, start, end,
+    avg_logprob, words) as faster-whisper decodes them, so the first sentence
+    can be translated / spoken while the rest is still being transcribed.
+    words is [(word, start, end, probability), ...] with word_timestamps=True.
+    """
     lang_code = LANGUAGE_CODE.get(language)          # None → auto-detect
 
-    kwargs = dict(word_timestamps=False)
+    kwargs = dict(word_timestamps=word_timestamps)
     if lang_code:
         kwargs["language"] = lang_code
 
-    segments, info = model.transcribe(audio_path, **kwargs)
+    # one preallocated float32 array (or a decode shared earlier), handed over as is
+    audio = load_pcm(audio_path) if isinstance(audio_path, (str, os.PathLike)) else audio_path
+
+    model = load_model()                             # stays resident for the next call
+    try:
+        segments, info = model.transcribe(audio, **kwargs)
+    except BaseException:
+        release_model(model)
+        raise
+    return SegmentStream(model, segments), CODE_TO_NAME.get(info.language, info.language)
+
+
+# ── language ID ───────────────────────────────────────────────────────────────
+
+def _language_features(model, audio_path, seconds):
+    extractor = model.feature_extractor
+    head   = iter_pcm(audio_path, max(seconds, LANG_SCAN), extractor.sampling_rate)
+    audio  = next(head, np.zeros(0, dtype=np.float32))   # decoding stops after the first block
+    head.close()
+    speech = get_speech_timestamps(audio, VadOptions())
+    if speech:                                       # skip intro music / silence
+        audio = np.concatenate([audio[span["start"]:span["end"]] for span in speech])
+    return pad_or_trim(extractor(audio[:int(seconds * extractor.sampling_rate)]))
+
+def detect_languages(paths, top_k=3, seconds=LANG_SECONDS, batch_size=BATCH_SIZE, workers=PREP_WORKERS):
+    """
+    detect_language for many files: heads are decoded in `workers` threads
+    while the previous group runs through the encoder, `batch_size` files
+    per language-ID call. Returns one top-k list per path, in order; [] for a
+    file that can't be read.
+    """
+    paths   = list(paths)
+    results = [[] for _ in paths]
+    model   = load_model()
+    try:
+        if not model.model.is_multilingual:
+            return [[("English", 1.0)] for _ in paths]
+
+        def features(path):
+            try:
+                return _language_features(model, path, seconds)
+            except Exception as e:
+                print(f"❌ {path}: {e}")
+                return None
+
+        groups = [list(range(i, min(i + batch_size, len(paths)))) for i in range(0, len(paths), batch_size)]
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            submit  = lambda group: [ex.submit(features, paths[i]) for i in group]
+            futures = submit(groups[0]) if groups else []
+            for n, group in enumerate(groups):
+                feats   = [f.result() for f in futures]
+                futures = submit(groups[n + 1]) if n + 1 < len(groups) else []
+                ready   = [(i, f) for i, f in zip(group, feats) if f is not None]
+                if not ready:
+                    continue
+                encoded = model.encode(np.stack([f for _, f in ready]))
+                for (i, _), probs in zip(ready, model.model.detect_language(encoded)):
+                    results[i] = [(CODE_TO_NAME.get(token[2:-2], token[2:-2]), prob)
+                                  for token, prob in probs[:top_k]]
+    finally:
+        release_model(model)
+    return results
+
+def detect_language(audio_path: str, top_k: int = 3, seconds: float = LANG_SECONDS) -> list:
+    """
+    [(language_name, probability)] top-k for `audio_path`, best first, from
+    one Whisper language-ID pass over its first `seconds` of speech; only
+    the start of the file is decoded and nothing is transcribed.
+    """
+    return detect_languages([audio_path], top_k, seconds)[0]
+
+
+# ── long files ────────────────────────────────────────────────────────────────
+
+def _split_at_silence(speech, sampling_rate, chunk_seconds):
+    """Group VAD speech spans into [(start, end)] sample ranges of ~chunk_seconds, cut mid-pause."""
+    if not speech:
+        return []
+    limit  = int(chunk_seconds * sampling_rate)
+    chunks = []
+    start, end = speech[0]["start"], speech[0]["end"]
+    for span in speech[1:]:
+        if span["end"] - start > limit:
+            cut = (end + span["start"]) // 2
+            chunks.append((start, cut))
+            start = cut
+        end = span["end"]
+    chunks.append((start, end))
+    return chunks
+
+def _words(text):
+    return [w for w in (re.sub(r"[^\w']", "", w).lower() for w in text.split()) if w]
+
+def _stitch(parts):
+    """Concatenate per-chunk segments in order, dropping what a chunk repeats across its boundary."""
+    out = []
+    for segments in parts:
+        for i, seg in enumerate(segments):
+            if out and seg.end <= out[-1].end:       # entirely inside what we already have
+                continue
+            if out and i == 0:
+                prev, head = _words(out[-1].text), _words(seg.text)
+                n = next((n for n in range(min(len(prev), len(head), 8), 0, -1)
+                          if prev[-n:] == head[:n] and (n > 1 or n == len(head))), 0)
+                if n == len(head):
+                    continue
+                if n:                                # drop the repeated leading words
+                    seg = seg._replace(text=" ".join(seg.text.split()[n:]))
+            out.append(seg)
+    return out
+
+def transcribe_long(audio_path: str, language: str = "Auto", workers: int = None,
+                    chunk_seconds: float = LONG_CHUNK) -> tuple[list, str]:
+    """
+    Long-form mode for CPU: VAD-split the file at pauses into ~chunk_seconds
+    chunks, transcribe them in parallel on `workers` CTranslate2 replicas
+    (num_workers, with the cores split between them via cpu_threads) and
+    stitch the segments back in order. Returns (list of TranscriptSegment,
+    language_name); the language is detected once for the whole file.
+
+    With one worker (the default on CUDA) this is the resident model of
+    get_transcript. The replicas are a separate pooled model: the default
+    one is freed first when idle, otherwise both count against the pool's
+    memory budget until one is reaped.
+    """
+    model_path, device, compute_type, options = _model_args("latency")
+    cores     = os.cpu_count() or 1
+    workers   = workers or (1 if device == "cuda" else LONG_WORKERS)
+    if workers == 1:
+        model = load_model()
+    else:
+        pool.discard(model_path, device, compute_type, **options)
+        model = load_model(cpu_threads=max(1, cores // workers), num_workers=workers)
+    try:
+        sampling_rate = model.feature_extractor.sampling_rate
+        audio  = load_pcm(audio_path, sampling_rate)
+        speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=300, speech_pad_ms=200))
+        total  = sum(span["end"] - span["start"] for span in speech) / sampling_rate
+        # at least two chunks per replica so a slow chunk doesn't idle the others
+        chunks = _split_at_silence(speech, sampling_rate, min(chunk_seconds, max(30.0, total / (2 * workers))))
+        if not chunks:
+            return [], language if language != "Auto" else None
+
+        lang_code = LANGUAGE_CODE.get(language)
+        if lang_code is None:
+            lang_code = "en"
+            if model.model.is_multilingual:
+                first = np.concatenate([audio[span["start"]:span["end"]] for span in speech[:64]])
+                lang_code, _, _ = model.detect_language(audio=first[:model.feature_extractor.n_samples])
+
+        def run(chunk):
+            start, end = chunk
+            offset = start / sampling_rate
+            segments, _ = model.transcribe(audio[start:end], language=lang_code, word_timestamps=False)
+            return [TranscriptSegment(s.text.strip(), s.start + offset, s.end + offset, s.avg_logprob)
+                    for s in segments]
+
+        with ThreadPoolExecutor(max_workers=workers) as ex:   # CTranslate2 runs them in parallel
+            parts = list(ex.map(run, chunks))
+    finally:
+        release_model(model)
+
+    return _stitch(parts), CODE_TO_NAME.get(lang_code, lang_code)
+
 
-    text          = " ".join(s.text.strip() for s in segments)
-    detected_name = CODE_TO_NAME.get(info.language, info.language)
+# ── many files ────────────────────────────────────────────────────────────────
 
-    unload_model()
-    return text, detected_name
+def _prepare(model, audio_path, lang_code):
+    """Decode + VAD-split + featurize one file (or its decoded samples): (language, chunk features, chunk times)."""
+    extractor = model.feature_extractor
+    audio = load_pcm(audio_path, extractor.sampling_rate) \
+            if isinstance(audio_path, (str, os.PathLike)) else audio_path
+    vad   = VadOptions(max_speech_duration_s=extractor.chunk_length, min_silence_duration_ms=160)
+    clips = merge_segments(get_speech_timestamps(audio, vad), vad)
+    if not clips:
+        return lang_code or "en", [], []
+
+    chunks, times = collect_chunks(audio, clips)
+    features = [extractor(chunk)[..., :-1] for chunk in chunks]
+    if lang_code is None:
+        lang_code = "en"
+        if model.model.is_multilingual:
+            lang_code, _, _ = model.detect_language(features=np.concatenate(features, axis=1))
+    return lang_code, [pad_or_trim(f) for f in features], times
+
+def _batch_options(tokenizer, beam_size):
+    # BatchedInferencePipeline.transcribe defaults
+    return TranscriptionOptions(
+        beam_size=beam_size, best_of=5, patience=1, length_penalty=1, repetition_penalty=1,
+        no_repeat_ngram_size=0, log_prob_threshold=-1.0, no_speech_threshold=0.6,
+        compression_ratio_threshold=2.4, condition_on_previous_text=False,
+        prompt_reset_on_temperature=0.5, temperatures=[0.0], initial_prompt=None, prefix=None,
+        suppress_blank=True, suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+        without_timestamps=True, max_initial_timestamp=0.0, word_timestamps=False,
+        prepend_punctuations="\"'“¿([{-", append_punctuations="\"'.。,，!！?？:：”)]}、",
+        multilingual=False, max_new_tokens=None, clip_timestamps=[],
+        hallucination_silence_threshold=None, hotwords=None,
+    )
+
+def transcribe_many(paths, language="Auto", batch_size=BATCH_SIZE, workers=PREP_WORKERS, beam_size=5):
+    """
+    Transcribe many files, yielding (audio_path, transcript_text, language_name)
+    for each one as soon as it is finished (completion order, not input order).
+
+    `workers` threads decode and VAD-split the files; their speech chunks go
+    into one shared queue, and chunks of different files in the same language
+    are decoded together, `batch_size` at a time, with faster-whisper's
+    batched inference. `language` is one name for all files or a list with
+    one per path. A file that can't be read yields (audio_path, None, None).
+    """
+    paths = list(paths)
+    for i, text, name in _transcribe_many(paths, language, batch_size, workers, beam_size):
+        yield paths[i], text, name
+
+def _transcribe_many(paths, language, batch_size, workers, beam_size):
+    # transcribe_many by position in `paths`: (index, text, language_name); a path may also be
+    # the file's 16 kHz samples when the caller already decoded it
+    languages = language if isinstance(language, (list, tuple)) else [language] * len(paths)
+    model     = load_model("throughput")
+    try:
+        pipeline = BatchedInferencePipeline(model)
+        decoders = {}                                # language → (tokenizer, options)
+        pending  = {}                                # language → [(file, chunk index, features, times)]
+        files    = {}                                # file index → {"language", "left", "texts"}
+
+        def run_batch(lang):
+            batch, pending[lang] = pending[lang][:batch_size], pending[lang][batch_size:]
+            if lang not in decoders:
+                tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual,
+                                      task="transcribe", language=lang)
+                decoders[lang] = tokenizer, _batch_options(tokenizer, beam_size)
+            tokenizer, options = decoders[lang]
+            results = pipeline.forward(np.stack([b[2] for b in batch]), tokenizer,
+                                       [b[3] for b in batch], options)
+            finished = []
+            for (n, i, _, _), segments in zip(batch, results):
+                state = files[n]
+                state["texts"][i] = " ".join(seg["text"].strip() for seg in segments)
+                state["left"] -= 1
+                if state["left"] == 0:
+                    finished.append(n)
+            return finished
+
+        def result(n):
+            state = files.pop(n)
+            text  = " ".join(t for t in state["texts"] if t)
+            return n, text, CODE_TO_NAME.get(state["language"], state["language"])
+
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            todo, running = list(reversed(range(len(paths)))), {}
+            while todo or running or any(pending.values()):
+                while todo and len(running) < workers * 2:      # bounded read-ahead
+                    n = todo.pop()
+                    running[ex.submit(_prepare, model, paths[n], LANGUAGE_CODE.get(languages[n]))] = n
+
+                full = [lang for lang, chunks in pending.items() if len(chunks) >= batch_size]
+                if running and not full:
+                    # keep the model busy: only block on decoding if there's nothing to run
+                    done, _ = wait(running, timeout=None if not any(pending.values()) else 0,
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        n = running.pop(future)
+                        try:
+                            lang, features, times = future.result()
+                        except Exception as e:
+                            print(f"❌ {paths[n]}: {e}")
+                            yield n, None, None
+                            continue
+                        files[n] = {"language": lang, "left": len(features), "texts": [""] * len(features)}
+                        if not features:
+                            yield result(n)
+                            continue
+                        pending.setdefault(lang, []).extend(
+                            (n, i, f, t) for i, (f, t) in enumerate(zip(features, times))
+                        )
+                    if done:
+                        continue
+
+                lang = max(pending, key=lambda l: len(pending[l]), default=None)
+                if lang is None or not pending[lang]:
+                    continue
+                for n in run_batch(lang):
+                    yield result(n)
+    finally:
+        release_model(model)
 
 
 # ── usage ─────────────────────────────────────────────────────────────────────
@@ -190,3 +491,22 @@ def get_transcript(audio_path: str, language: str = "Auto") -> tuple[str, str]:
 # text, lang = get_transcript("/content/audio.mp3")           # auto-detect
 # text, lang = get_transcript("/content/audio.mp3", "English")  # force language
 # print(lang, text)
+#
+# detect_language("/content/audio.mp3")                      # [("English", 0.97), ("Welsh", 0.01), ...]
+# detect_languages(paths, top_k=1)                           # batched, in input order
+#
+# segments, lang = get_timed_transcript("/content/audio.mp3")  # + seg.words: (word, start, end, prob)
+# subtitles.write_subtitles(segments, "/content/audio.srt")  # or .vtt
+#
+# segments, lang = stream_transcript("/content/audio.mp3")
+# for seg in segments:                                       # seg.text, seg.start, seg.end, seg.avg_logprob
+#     speak(translate(seg.text, lang))                       # starts before the file is finished
+#
+# segments, lang = transcribe_long("/content/podcast.mp3")   # hour-long file, all CPU cores
+# text = " ".join(s.text for s in segments)
+#
+# for path, text, lang in transcribe_many(glob.glob("/content/calls/*.wav")):
+#     print(path, lang, text)                                  # as each file finishes
+#
+# The model stays loaded between calls and is freed after WHISPER_IDLE_TIMEOUT
+# seconds unused (see model_pool); unload_model() frees it right away.
@@ -0,0 +1,98 @@
+import os
+import sys
+import glob
+import time
+import wave
+import tempfile
+import numpy as np
+import asr
+
+SAMPLE_RATE = 16000
+
+
+# ── synthetic audio ───────────────────────────────────────────────────────────
+
+def _voiced(seconds, rng):
+    # speech-like: a 100-220 Hz pulse train through two formant resonances, ~4 syllables/s
+    n     = int(seconds * SAMPLE_RATE)
+    t     = np.arange(n) / SAMPLE_RATE
+    f0    = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    src   = sum(np.sin(k * phase) / k for k in range(1, 30))
+    out   = np.zeros(n)
+    for formant in rng.uniform((500, 1200), (900, 2500)):
+        out += np.sin(2 * np.pi * formant * t) * src
+    syllables = 0.5 * (1 - np.cos(2 * np.pi * rng.uniform(3, 5) * t))
+    return out * syllables
+
+def make_wavs(folder, n=16, seconds=20, seed=0):
+    """`n` mono 16 kHz WAVs of ~`seconds` each: voiced phrases separated by pauses."""
+    os.makedirs(folder, exist_ok=True)
+    rng   = np.random.default_rng(seed)
+    paths = []
+    for i in range(n):
+        parts, total = [], 0.0
+        while total < seconds:
+            phrase, pause = rng.uniform(1.5, 6.0), rng.uniform(0.3, 1.5)
+            parts += [_voiced(phrase, rng), np.zeros(int(pause * SAMPLE_RATE))]
+            total += phrase + pause
+        audio = np.concatenate(parts)
+        audio = audio / (np.abs(audio).max() + 1e-9) * 0.5 + rng.normal(0, 0.003, audio.size)
+        path  = os.path.join(folder, f"synthetic_{i:03d}.wav")
+        with wave.open(path, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            w.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+        paths.append(path)
+    return paths
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def benchmark(folder=None, n=16, seconds=20, batch_size=asr.BATCH_SIZE, workers=asr.PREP_WORKERS):
+    """
+    get_transcript in a loop vs transcribe_many over the WAVs in `folder`
+    (synthetic ones are generated when it's None). The model is loaded
+    before timing, so both sides measure transcription only.
+    """
+    if folder is None:
+        folder = tempfile.mkdtemp(prefix="asr_bench_")
+        make_wavs(folder, n, seconds)
+    paths = sorted(glob.glob(os.path.join(folder, "*.wav")))
+    audio_seconds = 0.0
+    for path in paths:
+        with wave.open(path) as w:
+            audio_seconds += w.getnframes() / w.getframerate()
+
+    asr.release_model(asr.load_model())              # load both (and keep them resident) up front
+    asr.release_model(asr.load_model("throughput"))
+
+    start = time.perf_counter()
+    for path in paths:
+        asr.get_transcript(path, use_cache=False)        # time decodes, not cache hits
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    done = sum(1 for _, text, _ in asr.transcribe_many(paths, batch_size=batch_size, workers=workers)
+               if text is not None)
+    many = time.perf_counter() - start
+
+    print(f"🎧 {len(paths)} files, {audio_seconds / 60:.1f} min of audio")
+    print(f"   get_transcript loop  {loop:7.1f}s  {audio_seconds / loop:6.1f}x realtime")
+    print(f"   transcribe_many      {many:7.1f}s  {audio_seconds / many:6.1f}x realtime  "
+          f"(batch {batch_size}, {workers} workers, {done}/{len(paths)} ok)")
+    print(f"   speedup              {loop / many:7.2f}x")
+    return {"files": len(paths), "audio_seconds": audio_seconds, "loop": loop, "many": many}
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# python asr_benchmark.py                 # 16 synthetic 20 s WAVs in a temp folder
+# python asr_benchmark.py /content/wavs   # your own files
+#
+# import asr_benchmark
+# asr_benchmark.benchmark(n=32, seconds=60, batch_size=16)
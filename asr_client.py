@@ -0,0 +1,95 @@
+import os
+import json
+import time
+import socket
+import threading
+import http.client
+from urllib.parse import quote, urlsplit
+
+ASR_SERVER = os.environ.get("ASR_SERVER", "http://127.0.0.1:8765")   # or unix:///tmp/asr.sock
+RETRIES    = 8                       # attempts while the server answers 503 (queue full)
+
+_local = threading.local()
+
+
+# ── transport ─────────────────────────────────────────────────────────────────
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+def _connection(server, timeout):
+    if server.startswith("unix://"):
+        return _UnixConnection(server[len("unix://"):], timeout)
+    url = urlsplit(server)
+    return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+
+def _request(method, path, body=None, headers=None, server=ASR_SERVER, timeout=600):
+    """(status, JSON reply); 503s (queue full) and refused/reset connections are retried with backoff."""
+    for attempt in range(RETRIES):
+        last = attempt == RETRIES - 1
+        conn = _connection(server, timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            r    = conn.getresponse()
+            data = json.loads(r.read() or b"{}")
+            if r.status != 503 or last:
+                return r.status, data
+            wait = float(r.getheader("Retry-After", 1))
+        except (ConnectionRefusedError, ConnectionResetError, FileNotFoundError):
+            if last:
+                raise
+            wait = 0.5
+        finally:
+            conn.close()
+        time.sleep(wait * (1 + attempt) / 2)
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def get_transcript(audio_path: str, language: str = "Auto", use_cache: bool = True,
+                   server: str = ASR_SERVER, upload: bool = False, timeout: float = 600) -> tuple[str, str]:
+    """
+    asr.get_transcript through a running asr_server: (transcript_text,
+    detected_language_name). The server reads `audio_path` itself; with
+    upload=True the file is sent instead (server on another filesystem).
+    use_cache=False makes the server transcribe it even if it has before.
+    Raises RuntimeError if the server can't transcribe it.
+    """
+    if upload:
+        query = f"language={quote(language)}&use_cache={int(use_cache)}"
+        with open(audio_path, "rb") as f:
+            status, data = _request("POST", f"/transcribe?{query}", f.read(),
+                                    {"Content-Type": "application/octet-stream"}, server, timeout)
+    else:
+        body = json.dumps({"path": os.path.abspath(audio_path), "language": language,
+                           "use_cache": use_cache})
+        status, data = _request("POST", "/transcribe", body, {"Content-Type": "application/json"},
+                                server, timeout)
+    _local.result = data
+    if status != 200:
+        raise RuntimeError(f"ASR server {status}: {data.get('error')}")
+    return data["text"], data["language"]
+
+def last_result() -> dict:
+    """Full reply to this thread's last get_transcript: batch_size, cached, timings (queue/process/total s)."""
+    return getattr(_local, "result", None)
+
+def health(server: str = ASR_SERVER, timeout: float = 5) -> dict:
+    """Queue depth, jobs served and resident models of the server."""
+    return _request("GET", "/health", server=server, timeout=timeout)[1]
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from asr_client import get_transcript       # instead of: from asr import get_transcript
+#
+# text, lang = get_transcript("/content/audio.mp3")                 # server on ASR_SERVER
+# text, lang = get_transcript("/content/audio.mp3", "English", server="unix:///tmp/asr.sock")
+#
+# import asr_client; print(asr_client.last_result()["timings"])     # queue / process / total s
@@ -0,0 +1,227 @@
+import os
+import time
+from collections import namedtuple
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+import asr
+from audio_decode import SCALE, iter_pcm
+
+SAMPLE_RATE = 16000
+STEP        = float(os.environ.get("ASR_LIVE_STEP", 1.0))   # s of new audio between decodes
+END_PAUSE   = 0.6                    # s of silence that finalises an utterance
+MAX_WINDOW  = 20.0                   # s of unbroken speech decoded before its start is finalised
+PAD         = 0.2                    # s of audio kept around speech
+CONTEXT     = 200                    # chars of finalised text given to the next decode as prompt
+
+LiveResult = namedtuple("LiveResult", "text start end final")
+
+
+# ── recognizer ────────────────────────────────────────────────────────────────
+
+class LiveTranscriber:
+    """
+    Incremental transcription of a live 16 kHz mono stream with the resident
+    asr model. feed() appends PCM to one preallocated buffer; every `step`
+    seconds VAD finds the speech in it and
+      - an utterance followed by `end_pause` of silence is decoded once
+        (beam search), emitted as final and dropped from the buffer, so
+        finalised audio is never decoded again;
+      - the utterance still going on is re-decoded greedily and emitted as a
+        partial that the next partial / final replaces (less often than
+        every `step` when decoding can't keep up with the stream);
+      - an utterance longer than `max_window` is decoded once with beam
+        search: all but its last Whisper segment become final, the last
+        one the partial. This bounds both the buffer and decode latency.
+    Timestamps are seconds since the first fed sample.
+    """
+
+    def __init__(self, language="Auto", step=STEP, end_pause=END_PAUSE, max_window=MAX_WINDOW,
+                 beam_size=5):
+        self.lang_code  = asr.LANGUAGE_CODE.get(language)     # None → detected on the first final
+        self.language   = language if self.lang_code else None
+        self.step       = int(step * SAMPLE_RATE)
+        self.end_pause  = int(end_pause * SAMPLE_RATE)
+        self.max_window = int(max_window * SAMPLE_RATE)
+        self.beam_size  = beam_size
+        self.vad        = VadOptions(min_silence_duration_ms=int(end_pause * 1000),
+                                     speech_pad_ms=int(PAD * 1000))
+        self.buf        = np.empty(self.max_window + 2 * self.step + SAMPLE_RATE, dtype=np.float32)
+        self.size       = 0          # samples in buf
+        self.offset     = 0          # stream position of buf[0], in samples
+        self.pending    = 0          # samples fed since the last decode
+        self.next_step  = self.step  # pending samples that trigger the next decode
+        self.finals     = []         # finalised LiveResults
+        self.decodes    = 0
+        self.decode_seconds     = 0.0
+        self.max_decode_seconds = 0.0
+        self._model     = asr.load_model()
+
+    # ── input
+
+    def feed(self, pcm):
+        """Append int16 or float32 samples; returns the LiveResults this produced (often [])."""
+        pcm    = np.asarray(pcm).reshape(-1)
+        events = []
+        pos    = 0
+        while pos < pcm.size:
+            n   = min(self.buf.size - self.size, pcm.size - pos)
+            out = self.buf[self.size:self.size + n]
+            if pcm.dtype == np.int16:
+                np.multiply(pcm[pos:pos + n], SCALE, out=out, casting="unsafe")
+            else:
+                out[:] = pcm[pos:pos + n]
+            self.size    += n
+            self.pending += n
+            pos          += n
+            if self.pending >= self.next_step or self.size == self.buf.size:
+                events += self._update()
+        return events
+
+    def flush(self):
+        """Finalise whatever is left (end of stream); returns the final LiveResults."""
+        events = self._update(end=True) if self.size else []
+        self._drop(self.size)
+        return events
+
+    # ── decoding
+
+    def _seconds(self, sample):
+        return (self.offset + sample) / SAMPLE_RATE
+
+    def _drop(self, n):
+        """Forget the first n buffered samples (already final, or silence)."""
+        n = max(0, min(n, self.size))
+        self.buf[:self.size - n] = self.buf[n:self.size]
+        self.offset += n
+        self.size   -= n
+
+    def _decode(self, start, end, beam_size):
+        began  = time.perf_counter()
+        prompt = " ".join(r.text for r in self.finals)[-CONTEXT:]
+        segments, info = self._model.transcribe(
+            self.buf[start:end], language=self.lang_code, beam_size=beam_size, vad_filter=False,
+            condition_on_previous_text=False, initial_prompt=prompt or None,
+        )
+        segments = [s for s in segments if s.text.strip()]
+        took = time.perf_counter() - began
+        self.decodes            += 1
+        self.decode_seconds     += took
+        self.max_decode_seconds  = max(self.max_decode_seconds, took)
+        return segments, info
+
+    def _final(self, start, end, decoded=None):
+        segments, info = decoded or self._decode(start, end, self.beam_size)
+        if self.lang_code is None:                   # keep one language for the whole session
+            self.lang_code = info.language
+            self.language  = asr.CODE_TO_NAME.get(info.language, info.language)
+        text = " ".join(s.text.strip() for s in segments)
+        if not text:
+            return []
+        result = LiveResult(text, self._seconds(start), self._seconds(end), True)
+        self.finals.append(result)
+        return [result]
+
+    def _update(self, end=False):
+        began = time.perf_counter()
+        try:
+            return self._decide(end)
+        finally:
+            # decoding gets at most half the stream's time: a slow host emits fewer partials
+            # instead of falling ever further behind
+            self.pending   = 0
+            self.next_step = max(self.step, int(2 * (time.perf_counter() - began) * SAMPLE_RATE))
+
+    def _decide(self, end):
+        spans = get_speech_timestamps(self.buf[:self.size], self.vad)
+        if not spans:                                # silence: keep only what a word may start in
+            self._drop(self.size - int(PAD * SAMPLE_RATE))
+            return []
+
+        events = []
+        last   = spans[-1]
+        closed = end or (self.size - last["end"]) + int(PAD * SAMPLE_RATE) >= self.end_pause
+        for span in spans if closed else spans[:-1]:
+            events += self._final(span["start"], span["end"])
+        if closed:
+            self._drop(last["end"])
+            return events
+
+        # the utterance still in progress
+        self._drop(last["start"])
+        if self.size > self.max_window:
+            # one beam decode gives both the final (segments before the cut) and the partial
+            segments, info = self._decode(0, self.size, self.beam_size)
+            keep = int(segments[-1].start * SAMPLE_RATE) if len(segments) > 1 else self.size
+            if not 0 < keep <= self.size or self.size - keep > self.max_window // 2:
+                keep = self.size                     # no usable cut: finalise it all
+            done = segments[:-1] if keep < self.size else segments
+            events += self._final(0, keep, (done, info))
+            self._drop(keep)
+            if self.size:
+                events.append(LiveResult(segments[-1].text.strip(), self._seconds(0),
+                                         self._seconds(self.size), False))
+            return events
+
+        segments, _ = self._decode(0, self.size, 1)
+        text = " ".join(s.text.strip() for s in segments)
+        if text:
+            events.append(LiveResult(text, self._seconds(0), self._seconds(self.size), False))
+        return events
+
+    # ── lifecycle
+
+    def text(self):
+        """Everything finalised so far."""
+        return " ".join(r.text for r in self.finals)
+
+    def stats(self):
+        audio = (self.offset + self.size) / SAMPLE_RATE
+        return {"audio_seconds": audio, "decodes": self.decodes, "decode_seconds": self.decode_seconds,
+                "max_decode_seconds": self.max_decode_seconds,
+                "rtf": self.decode_seconds / audio if audio else 0.0}
+
+    def close(self):
+        if self._model is not None:
+            model, self._model = self._model, None
+            asr.release_model(model)
+
+    __del__ = close
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def live_transcribe(blocks, language="Auto", **kwargs):
+    """LiveResults for an iterable of 16 kHz mono PCM blocks (int16 or float32), flushed at the end."""
+    with LiveTranscriber(language, **kwargs) as live:
+        for block in blocks:
+            yield from live.feed(block)
+        yield from live.flush()
+
+def simulate(audio_path, speed=1.0, block_seconds=0.1):
+    """Blocks of `audio_path` paced like a live source (speed=2: twice real time, 0: no pacing)."""
+    began, sent = time.perf_counter(), 0.0
+    for block in iter_pcm(audio_path, block_seconds):
+        sent += block.size / SAMPLE_RATE
+        if speed:
+            time.sleep(max(0.0, began + sent / speed - time.perf_counter()))
+        yield block
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from asr_live import LiveTranscriber, live_transcribe, simulate
+#
+# for r in live_transcribe(simulate("/content/talk.wav")):      # a WAV in real time
+#     print("✅" if r.final else "…", f"{r.start:6.1f}-{r.end:6.1f}", r.text)
+#
+# with LiveTranscriber("English") as live:                        # e.g. int16 PCM from a socket
+#     while data := conn.recv(3200):
+#         for r in live.feed(np.frombuffer(data, dtype=np.int16)):
+#             show_caption(r.text, replace=not r.final)
+#     live.flush()
+#     print(live.stats())   # decodes, decode_seconds, max_decode_seconds, rtf
@@ -0,0 +1,256 @@
+import os
+import sys
+import json
+import time
+import queue
+import tempfile
+import threading
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+import asr
+
+ASR_SERVER = os.environ.get("ASR_SERVER", "http://127.0.0.1:8765")   # or unix:///tmp/asr.sock
+MAX_BATCH  = int(os.environ.get("ASR_MAX_BATCH", 8))                 # files per batch
+CHUNK_BATCH = int(os.environ.get("ASR_CHUNK_BATCH", asr.BATCH_SIZE)) # speech chunks per forward pass
+MAX_WAIT   = float(os.environ.get("ASR_MAX_WAIT_MS", 50)) / 1000      # s a job waits for company
+QUEUE_SIZE = int(os.environ.get("ASR_QUEUE_SIZE", 64))               # queued jobs before 503
+
+
+# ── batching ──────────────────────────────────────────────────────────────────
+
+class _Job:
+    def __init__(self, path, language, audio=None):
+        self.path     = path
+        self.language = language
+        self.audio    = audio                        # 16 kHz samples if already decoded, else None
+        self.queued   = time.perf_counter()
+        self.done     = threading.Event()
+        self.result   = None
+
+class Batcher:
+    """
+    One thread owning the model: takes up to `max_batch` queued jobs (files),
+    waiting at most `max_wait` seconds after the first for more to arrive,
+    and runs them through asr's cross-file batched inference, `chunk_batch`
+    speech chunks per forward pass. submit() refuses a job when `queue_size`
+    are already waiting, so callers can back off.
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, max_wait=MAX_WAIT, queue_size=QUEUE_SIZE,
+                 chunk_batch=CHUNK_BATCH):
+        self.max_batch   = max_batch
+        self.chunk_batch = chunk_batch
+        self.max_wait    = max_wait
+        self.jobs      = queue.Queue(maxsize=queue_size)
+        self.served    = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, path, language="Auto", audio=None):
+        """
+        The queued job (wait on job.done, then read job.result), or None if
+        the queue is full. `audio`: the file's 16 kHz samples when the caller
+        already decoded them (e.g. for the cache digest), so they aren't
+        decoded again.
+        """
+        job = _Job(path, language, audio)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            return None
+        return job
+
+    def _run(self):
+        while True:
+            batch    = [self.jobs.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.jobs.get(timeout=max(0.0, deadline - time.perf_counter())))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        started = time.perf_counter()
+        try:
+            results = asr._transcribe_many([j.path if j.audio is None else j.audio for j in batch],
+                                           [j.language for j in batch],
+                                           self.chunk_batch, asr.PREP_WORKERS, 5)
+            for i, text, name in results:
+                job, now = batch[i], time.perf_counter()
+                job.result = {
+                    "text": text, "language": name,
+                    "error": None if text is not None else f"can't read {job.path}",
+                    "batch_size": len(batch),
+                    "timings": {"queue": started - job.queued, "process": now - started,
+                                "total": now - job.queued},
+                }
+                job.done.set()
+        except Exception as e:
+            print(f"❌ batch of {len(batch)} failed: {e}")
+        finally:
+            for job in batch:
+                job.audio = None                     # the samples aren't needed any more
+                if not job.done.is_set():
+                    job.result = {"text": None, "language": None, "error": "transcription failed",
+                                  "batch_size": len(batch)}
+                    job.done.set()
+            self.served += len(batch)
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def log_message(self, *args):                    # one line per request is too chatty
+        pass
+
+    def _reply(self, status, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            return self._reply(404, {"error": "not found"})
+        self._reply(200, {
+            "queued": self.batcher.jobs.qsize(), "queue_size": self.batcher.jobs.maxsize,
+            "served": self.batcher.served, "models": asr.pool.stats(),
+        })
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/transcribe":
+            return self._reply(404, {"error": "not found"})
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        # JSON {"path", "language", "use_cache"} for a file this host can read, or the audio itself
+        tmp = None
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                req = json.loads(body)
+                path, language = req["path"], req.get("language", "Auto")
+                use_cache = bool(req.get("use_cache", True))
+            except (ValueError, KeyError):
+                return self._reply(400, {"error": "expected {\"path\": ..., \"language\": ...}"})
+        else:
+            query     = parse_qs(url.query)
+            language  = query.get("language", ["Auto"])[0]
+            use_cache = query.get("use_cache", ["1"])[0] not in ("0", "false")
+            fd, tmp   = tempfile.mkstemp(prefix="asr_upload_")
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            path = tmp
+
+        try:
+            self._transcribe(path, language, use_cache, index=tmp is None)
+        finally:
+            if tmp:
+                os.remove(tmp)
+
+    def _transcribe(self, path, language, use_cache, index):
+        started = time.perf_counter()
+        replies = []                                 # the job's reply, when one was queued
+
+        def transcribe(audio):
+            # the samples the cache decoded for its digest go with the job: no second decode
+            job = self.batcher.submit(path, language, None if audio is path else audio)
+            if job is None:
+                raise _QueueFull()
+            job.done.wait()
+            replies.append(job.result)
+            if job.result["error"] is not None:
+                raise _JobFailed()                   # failures aren't cached
+            return {"text": job.result["text"], "language": job.result["language"], "segments": []}
+
+        try:
+            if not use_cache:
+                transcribe(path)
+            else:
+                # a retried / repeated job is answered from the transcript cache, never queued;
+                # batched decodes are keyed apart from asr.get_transcript's
+                result = asr._cached(path, transcribe, language,
+                                     {"word_timestamps": False, "batched": True}, index, "throughput")
+                if not replies:
+                    total = time.perf_counter() - started
+                    replies.append({"text": result["text"], "language": result["language"],
+                                    "error": None, "batch_size": 0, "cached": True,
+                                    "timings": {"queue": 0.0, "process": total, "total": total}})
+        except _QueueFull:                           # backpressure: come back later
+            return self._reply(503, {"error": "queue full"}, {"Retry-After": "1"})
+        except _JobFailed:
+            pass
+        except Exception as e:                       # the cache couldn't decode it either
+            replies.append({"text": None, "language": None, "error": f"can't read {path}: {e}",
+                            "batch_size": 0})
+        reply = replies[0]
+        self._reply(200 if reply["error"] is None else 422, reply)
+
+class _QueueFull(Exception):
+    pass
+
+class _JobFailed(Exception):
+    pass
+
+class _TCPHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128                         # listen backlog (socketserver default: 5)
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads     = True
+    request_queue_size = 128
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)                  # BaseHTTPRequestHandler wants a (host, port)
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def make_server(address=ASR_SERVER, max_batch=MAX_BATCH, max_wait=MAX_WAIT, queue_size=QUEUE_SIZE,
+                chunk_batch=CHUNK_BATCH):
+    """HTTP server for `address` (http://host:port or unix:///path.sock), not yet serving."""
+    batcher = Batcher(max_batch, max_wait, queue_size, chunk_batch)
+    handler = type("Handler", (_Handler,), {"batcher": batcher})
+    if address.startswith("unix://"):
+        path = address[len("unix://"):]
+        if os.path.exists(path):
+            os.remove(path)
+        return _UnixHTTPServer(path, handler)
+    url = urlsplit(address)
+    return _TCPHTTPServer((url.hostname or "127.0.0.1", url.port or 8765), handler)
+
+def serve(address=ASR_SERVER, **kwargs):
+    """Load the model once and answer transcription requests until interrupted."""
+    asr.release_model(asr.load_model("throughput"))  # resident before the first request
+    server  = make_server(address, **kwargs)
+    batcher = server.RequestHandlerClass.batcher
+    print(f"🎙️ ASR server on {address} (batch ≤{batcher.max_batch} files / {batcher.chunk_batch} chunks, "
+          f"wait ≤{batcher.max_wait * 1000:.0f} ms, queue {batcher.jobs.maxsize})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else ASR_SERVER)
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# python asr_server.py                          # http://127.0.0.1:8765
+# python asr_server.py unix:///tmp/asr.sock
+#
+# ASR_MAX_BATCH=16 ASR_CHUNK_BATCH=16 ASR_MAX_WAIT_MS=100 ASR_QUEUE_SIZE=128 python asr_server.py
+#
+# Apps then use asr_client.get_transcript (same signature as asr.get_transcript)
+# and share one model and its batches instead of loading a copy each. Repeated
+# files are answered from the transcript cache without queueing.
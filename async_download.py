@@ -0,0 +1,390 @@
+# !pip install aiohttp
+import os
+import time
+import shutil
+import asyncio
+import threading
+from tqdm.auto import tqdm
+from concurrent.futures import ThreadPoolExecutor
+from fast_download import (
+    CHUNK_SIZE, PART_SUFFIX, RETRIES, BACKOFF, SHOW_PROGRESS, ChecksumError, RateLimiter,
+    checksum_file, fetch_file, reserve,
+    _RangeTracker, _ShortRead, _StreamingHash, _content_range_total, _discard, _load_state,
+    _missing, _open_prealloc, _plan, _pwrite,
+)
+from model_cache import blob_key, blob_path, get_manifest, mark_verified, materialize, verify_file
+from downloader import filter_files, record_bandwidth, schedule
+from endpoints import file_urls
+from file_lock import FileLock, folder_lock
+from download_metrics import DownloadRun
+try:
+  import aiohttp
+except Exception as e:
+  print(e)
+
+RETRY_STATUS = (429, 500, 502, 503, 504)   # retried with backoff, as by fast_download's session
+
+
+# ── bandwidth budget ──────────────────────────────────────────────────────────
+
+async def _throttle(n, limiter):
+    # fast_download's caps (process-wide and this run's): the wait is computed under their locks,
+    # the sleep happens on the loop, so one waiting coroutine doesn't hold up the others
+    wait = reserve(n, limiter)
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+# ── one file ──────────────────────────────────────────────────────────────────
+
+def _transient():
+    return (aiohttp.ClientError, asyncio.TimeoutError, _ShortRead)
+
+def _retry_wait(headers, attempt):
+    """Seconds before retry `attempt`: the server's Retry-After if it sent one, else backoff."""
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return BACKOFF * 2 ** attempt
+
+async def _stream(resp, fd, start, stop, tracker, bar, limiter, chunk_size):
+    offset = start
+    async for chunk in resp.content.iter_chunked(chunk_size):
+        chunk = chunk[: stop - offset]
+        await _throttle(len(chunk), limiter)
+        _pwrite(fd, chunk, offset)
+        offset += len(chunk)
+        bar.update(len(chunk))
+        tracker.advance(start, offset, chunk)
+        if offset >= stop:
+            break
+    if offset != stop:
+        raise _ShortRead(f"short read for bytes {start}-{stop - 1} ({offset - start} received)")
+
+async def _fetch_range(session, url, fd, start, stop, tracker, bar, limiter, chunk_size):
+    for attempt in range(RETRIES + 1):
+        try:
+            headers = {"Range": f"bytes={start}-{stop - 1}"}
+            async with session.get(url, headers=headers) as resp:
+                resp.raise_for_status()
+                if resp.status != 206:
+                    raise IOError(f"server ignored Range for bytes {start}-{stop - 1}")
+                await _stream(resp, fd, start, stop, tracker, bar, limiter, chunk_size)
+            return
+        except aiohttp.ClientResponseError as e:
+            if e.status not in RETRY_STATUS or attempt == RETRIES:
+                raise
+            await asyncio.sleep(_retry_wait(e.headers or {}, attempt))
+        except _transient():
+            start = tracker.position(start)
+            if attempt == RETRIES:
+                raise
+            await asyncio.sleep(BACKOFF * 2 ** attempt)
+
+async def _open(session, url, start, etag):
+    headers = {"Range": f"bytes={start}-"}
+    if etag and not etag.startswith("W/"):
+        headers["If-Range"] = etag
+    for attempt in range(RETRIES + 1):
+        resp = await session.get(url, headers=headers)
+        if resp.status == 416 and start == 0:
+            resp.release()
+            resp = await session.get(url)
+        if resp.status not in RETRY_STATUS or attempt == RETRIES:
+            return resp
+        resp.release()
+        await asyncio.sleep(_retry_wait(resp.headers, attempt))
+
+async def _fetch(session, url, path, connections, resume, bar, limiter, chunk_size, checksum=None):
+    """Async twin of fast_download.fetch_file: same .part / sidecar format, one shared bar."""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    part  = path + PART_SUFFIX
+    state = _load_state(part) if resume else None
+    if state is None:
+        _discard(part)
+    if state and not _missing(state["done"], state["size"]):
+        if checksum and not checksum_file(part, checksum):
+            _discard(part)
+            raise ChecksumError(f"checksum mismatch for {os.path.basename(path)}")
+        os.replace(part, path)
+        _discard(part)
+        return state["size"]
+
+    start = _missing(state["done"], state["size"])[0][0] if state else 0
+    resp  = await _open(session, url, start, state and state.get("etag"))
+    if state and resp.status >= 400 and _content_range_total(resp) in (None, state["size"]):
+        resp.release()                               # mirror without the file, 5xx: keep the .part
+        resp.raise_for_status()
+    if state and (
+        resp.status != 206
+        or _content_range_total(resp) != state["size"]
+        or resp.headers.get("etag", state.get("etag")) != state.get("etag")
+    ):
+        resp.release()
+        _discard(part)
+        state = None
+        resp  = await _open(session, url, 0, None)
+
+    tracker = None
+    try:
+        resp.raise_for_status()
+        total = _content_range_total(resp)
+
+        if resp.status != 206 or total is None:
+            total  = 0
+            plain  = "content-length" in resp.headers and "content-encoding" not in resp.headers
+            hasher = _StreamingHash(checksum, int(resp.headers["content-length"])) \
+                     if checksum and plain else None
+            with open(part, "wb") as f:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    await _throttle(len(chunk), limiter)
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(total, chunk)
+                    total += len(chunk)
+                    bar.update(len(chunk))
+            if hasher is not None:
+                hasher.check(os.path.basename(path))
+            elif checksum and not checksum_file(part, checksum):
+                raise ChecksumError(f"checksum mismatch for {os.path.basename(path)}")
+        else:
+            done    = state["done"] if state else []
+            parts   = _plan(_missing(done, total), connections)
+            bar.update(total - sum(e - s for s, e in parts))
+            fd = _open_prealloc(part, total, keep=state is not None)
+            hasher  = _StreamingHash(checksum, total, fd, done) if checksum else None
+            tracker = _RangeTracker(part, url, resp.headers.get("etag"), total, done, hasher)
+            try:
+                final_url = str(resp.url)
+                tasks = [
+                    asyncio.ensure_future(
+                        _fetch_range(session, final_url, fd, s, e, tracker, bar, limiter, chunk_size)
+                    )
+                    for s, e in parts[1:]
+                ]
+                try:
+                    if parts:
+                        first, stop = parts[0]
+                        try:
+                            await _stream(resp, fd, first, stop, tracker, bar, limiter, chunk_size)
+                        except _transient():
+                            resp.release()
+                            await _fetch_range(session, final_url, fd, tracker.position(first), stop,
+                                               tracker, bar, limiter, chunk_size)
+                        finally:
+                            resp.close()             # drop the rest of "bytes=N-" and free the slot
+                    await asyncio.gather(*tasks)
+                finally:
+                    for t in tasks:
+                        t.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                if hasher is not None:
+                    hasher.check(os.path.basename(path))
+            finally:
+                os.close(fd)
+
+        os.replace(part, path)
+        _discard(part)
+        return total
+    except ChecksumError:
+        _discard(part)
+        raise
+    except BaseException:
+        if tracker is not None:
+            try: tracker.save()
+            except Exception: pass
+        raise
+    finally:
+        resp.release()
+
+
+# ── engine ────────────────────────────────────────────────────────────────────
+
+async def download_files(files, workers=64, connections=8, redownload=False,
+                         max_bandwidth=None, chunk_size=CHUNK_SIZE, timeout=60):
+    """
+    Download many files concurrently on one event loop.
+
+    `files` is a list of dicts with "url", "path" and optionally "size"
+    (for the skip check and the progress total), "checksum" (see
+    fast_download.fetch_file) and "key" (blob store key, see model_cache). `workers` caps the open connections across all files
+    and ranges, `max_bandwidth` (bytes/s) caps their combined rate on top
+    of the process-wide cap (fast_download.set_max_bandwidth), and a single
+    tqdm bar reports the aggregate progress.
+
+    Returns a list of (path, status, error) with status SKIPPED, CACHED,
+    DOWNLOADED or FAILED.
+    """
+    limiter  = RateLimiter(max_bandwidth) if max_bandwidth else None   # this run's cap
+    total   = sum(f.get("size") or 0 for f in files)
+    # requests queue on the connector in creation order → start the biggest first
+    order   = sorted(range(len(files)), key=lambda i: files[i].get("size") or 0, reverse=True)
+    results = []
+
+    connector = aiohttp.TCPConnector(limit=workers, limit_per_host=0, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        with tqdm(total=total, unit="B", unit_scale=True, desc="Overall",
+                  disable=not SHOW_PROGRESS) as bar:
+
+            async def one(f):
+                path, size, key = f["path"], f.get("size"), f.get("key")
+                checksum = f.get("checksum") or key
+                if not redownload and os.path.exists(path) and os.path.getsize(path) > 0 \
+                        and (size is None or os.path.getsize(path) == size) \
+                        and (not checksum or verify_file(path, checksum)):
+                    bar.update(size or 0)
+                    return path, "SKIPPED", None
+                try:
+                    target = blob_path(key) if key else path
+                    # one writer per blob (or file) across tasks, engines and processes, as in
+                    # fetch_blob; waiting happens off the loop
+                    lock = FileLock(target, quiet=True)
+                    await asyncio.to_thread(lock.acquire)
+                    try:
+                        if key and not redownload and verify_file(target, key):
+                            bar.update(size or 0)
+                            status = "CACHED"
+                        else:
+                            await _fetch(session, f["url"], target, connections, not redownload,
+                                         bar, limiter, chunk_size, checksum=checksum)
+                            if checksum:
+                                mark_verified(target, checksum)
+                            status = "DOWNLOADED"
+                    finally:
+                        lock.release()
+                    if key:
+                        materialize(target, path)
+                        mark_verified(path, key)
+                    return path, status, None
+                except Exception as e:
+                    return path, "FAILED", e
+
+            done = await asyncio.gather(*(one(files[i]) for i in order))
+            results = [None] * len(files)
+            for i, r in zip(order, done):
+                results[i] = r
+    return results
+
+
+def _run(coro):
+    # Colab/Jupyter already run an event loop in this thread → use a fresh one in another
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    box = {}
+    def target():
+        try:
+            box["result"] = asyncio.run(coro)
+        except BaseException as e:
+            box["error"] = e
+    t = threading.Thread(target=target)
+    t.start()
+    t.join()
+    if "error" in box:
+        raise box["error"]
+    return box["result"]
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def download_model(repo_id, download_folder="./", redownload=False, workers=64, connections=8,
+                   use_cache=True, max_bandwidth=None, allow_patterns=None, ignore_patterns=None,
+                   prefer_safetensors=True):
+    """
+    Same call as asr.download_model, but every file and range request is
+    scheduled on one asyncio loop instead of a thread per file, so `workers`
+    can go into the hundreds. Returns the folder, or None if a file failed.
+    """
+    start = time.time()
+    download_dir = os.path.abspath(download_folder)
+    os.makedirs(download_dir, exist_ok=True)
+    print(f"📂 {download_dir}")
+    run = DownloadRun(repo_id, download_dir, "async", workers, connections)
+
+    siblings, eta = schedule(
+        filter_files(get_manifest(repo_id)["siblings"], allow_patterns, ignore_patterns,
+                     prefer_safetensors),
+        workers, connections,
+        download_dir=None if redownload else download_dir,
+    )
+    files = [
+        {
+            "url":  file_urls(repo_id, s["rfilename"])[0],
+            "path": os.path.join(download_dir, s["rfilename"]),
+            "size": s.get("size"),
+            "key":  blob_key(s) if use_cache else None,
+            "checksum": blob_key(s),
+        }
+        for s in siblings
+    ]
+    print(f"🚀 Async download | {len(files)} files | workers={workers} | ~{eta:.0f}s predicted")
+
+    with folder_lock(download_dir):                  # other processes wait, then skip every file
+        results = _run(download_files(files, workers, connections, redownload, max_bandwidth))
+    counts  = {}
+    for f, (path, status, error) in zip(files, results):
+        run.file(os.path.relpath(path, download_dir), status, "async",
+                 bytes=f["size"] or 0 if status == "DOWNLOADED" else 0, error=error)
+        counts[status] = counts.get(status, 0) + 1
+        if status == "FAILED":
+            print(f"❌ Failed: {os.path.basename(path)} ({error})")
+    record_bandwidth(
+        sum(f["size"] or 0 for f, r in zip(files, results) if r[1] == "DOWNLOADED"),
+        time.time() - start,
+    )
+
+    print(f"📊 {counts.get('DOWNLOADED', 0)} downloaded | {counts.get('CACHED', 0)} cached | "
+          f"{counts.get('SKIPPED', 0)} skipped | {counts.get('FAILED', 0)} failed")
+    run.finish(not counts.get("FAILED"))
+    if counts.get("FAILED"):
+        return None
+    print(f"✅ Done  ⏱ {time.time()-start:.1f}s")
+    return download_dir
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def benchmark(base_url, names, download_folder="./download_bench", workers=64, connections=8):
+    """
+    Time the thread engine (ThreadPoolExecutor + fetch_file, as in
+    asr.download_model) against this one on the same files, fetched from
+    `base_url` — e.g. a local test server. Returns {engine: seconds}.
+    """
+    total = 0
+    times = {}
+    for engine in ("threads", "async"):
+        folder = os.path.abspath(os.path.join(download_folder, engine))
+        shutil.rmtree(folder, ignore_errors=True)
+        files = [{"url": f"{base_url.rstrip('/')}/{n}", "path": os.path.join(folder, n)} for n in names]
+
+        t0 = time.time()
+        if engine == "threads":
+            with ThreadPoolExecutor(max_workers=min(workers, 32)) as ex:
+                list(ex.map(lambda f: fetch_file(f["url"], f["path"], connections=connections), files))
+        else:
+            for path, status, error in _run(download_files(files, workers, connections, redownload=True)):
+                if error:
+                    raise error
+        times[engine] = time.time() - t0
+        total = sum(os.path.getsize(f["path"]) for f in files)
+
+    for engine, secs in times.items():
+        print(f"⏱ {engine:8s} {secs:6.2f}s  {total / secs / 1e6:8.1f} MB/s")
+    return times
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from async_download import download_model
+# download_model("deepdml/faster-whisper-large-v3-turbo-ct2", "./faster-whisper-large-v3-turbo-ct2",
+#                workers=128, max_bandwidth=50e6)
+#
+# Benchmark against the thread engine with a local server (http.server has a
+# listen backlog of 5, so use a real server such as nginx for workers >> 5):
+#   python -m http.server 8000 --directory ./some_model_folder
+#   from async_download import benchmark
+#   benchmark("http://127.0.0.1:8000", ["model.bin", "config.json", "tokenizer.json"])
@@ -0,0 +1,178 @@
+import os
+import time
+import resource
+import threading
+from collections import OrderedDict
+import av
+import numpy as np
+
+SAMPLE_RATE   = 16000                # what Whisper and Silero VAD take
+BLOCK_SECONDS = 30.0                 # iter_pcm block: one Whisper window
+SHARE_LIMIT   = int(float(os.environ.get("AUDIO_SHARE_BYTES", 256 * 1024 * 1024)))   # ≈ 70 min at 16 kHz
+SCALE         = np.float32(1 / 32768)
+
+
+# ── decoding ──────────────────────────────────────────────────────────────────
+
+def _frames(audio_path, sampling_rate=SAMPLE_RATE):
+    """Mono int16 arrays at `sampling_rate`, as PyAV decodes and resamples them."""
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=sampling_rate)
+    with av.open(audio_path, mode="r", metadata_errors="ignore") as container:
+        stream = container.streams.audio[0]
+        stream.thread_type = "AUTO"                  # codec frame threading where supported
+        frames = container.decode(stream)
+        while True:
+            try:
+                frame = next(frames)
+            except StopIteration:
+                break
+            except av.error.InvalidDataError:
+                continue
+            frame.pts = None
+            for out in resampler.resample(frame):
+                yield out.to_ndarray().reshape(-1)
+        for out in resampler.resample(None):         # flush
+            yield out.to_ndarray().reshape(-1)
+
+def _duration(audio_path):
+    try:
+        with av.open(audio_path, mode="r", metadata_errors="ignore") as container:
+            stream = container.streams.audio[0]
+            if stream.duration and stream.time_base:
+                return float(stream.duration * stream.time_base)
+            return container.duration / av.time_base if container.duration else None
+    except (av.error.FFmpegError, IndexError):
+        return None
+
+def iter_pcm(audio_path, block_seconds=BLOCK_SECONDS, sampling_rate=SAMPLE_RATE, out=None):
+    """
+    16 kHz mono float32 in blocks of `block_seconds` (the last one shorter),
+    converted in place into one reused buffer (`out`, or allocated once):
+    memory stays at one block however long the file is. Each block is a
+    view of that buffer, valid until the next one is requested; copy it to
+    keep it.
+    """
+    block  = out if out is not None else np.empty(int(block_seconds * sampling_rate), dtype=np.float32)
+    filled = 0
+    for pcm in _frames(audio_path, sampling_rate):
+        pos = 0
+        while pos < pcm.size:
+            n = min(block.size - filled, pcm.size - pos)
+            np.multiply(pcm[pos:pos + n], SCALE, out=block[filled:filled + n], casting="unsafe")
+            filled += n
+            pos    += n
+            if filled == block.size:
+                yield block
+                filled = 0
+    if filled:
+        yield block[:filled]
+
+def load_pcm(audio_path, sampling_rate=SAMPLE_RATE, share_result=False, stats=None):
+    """
+    Whole file as one contiguous 16 kHz mono float32 array, ready for
+    WhisperModel.transcribe / VAD as is. The array is preallocated from the
+    container's duration and filled in place, so peak memory is the result
+    itself (decode_audio holds an s16 copy and a growing buffer on top).
+    A decode shared before (see share) is returned without decoding;
+    share_result=True shares this one too (it then stays in memory).
+    stats, if given, is filled with audio_seconds, decode_seconds,
+    buffer_bytes, peak_rss_bytes and reused.
+    """
+    start = time.perf_counter()
+    audio = shared(audio_path) if sampling_rate == SAMPLE_RATE else None
+    if audio is None:
+        duration = _duration(audio_path)
+        buf    = np.empty(int((duration or 60.0) * sampling_rate) + sampling_rate, dtype=np.float32)
+        filled = 0
+        for pcm in _frames(audio_path, sampling_rate):
+            if filled + pcm.size > buf.size:         # duration was missing or wrong
+                grown = np.empty(max(buf.size * 3 // 2, filled + pcm.size), dtype=np.float32)
+                grown[:filled] = buf[:filled]
+                buf = grown
+            np.multiply(pcm, SCALE, out=buf[filled:filled + pcm.size], casting="unsafe")
+            filled += pcm.size
+        audio = buf[:filled] if filled > buf.size // 2 else buf[:filled].copy()
+        if share_result and sampling_rate == SAMPLE_RATE:
+            share(audio_path, audio)
+        reused = False
+    else:
+        reused = True
+
+    if stats is not None:
+        stats.update(
+            audio_seconds=audio.size / sampling_rate, decode_seconds=time.perf_counter() - start,
+            buffer_bytes=audio.base.nbytes if audio.base is not None else audio.nbytes,
+            peak_rss_bytes=peak_rss(), reused=reused,
+        )
+    return audio
+
+def peak_rss():
+    """Peak resident memory of this process so far, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+# ── sharing decodes ───────────────────────────────────────────────────────────
+
+_shared      = OrderedDict()         # (path, size, mtime, inode) → float32 samples
+_shared_lock = threading.Lock()
+
+def _key(audio_path):
+    try:
+        st = os.stat(audio_path)
+    except (OSError, TypeError):                     # file-like objects aren't shared
+        return None
+    return os.path.abspath(audio_path), st.st_size, st.st_mtime_ns, st.st_ino
+
+def _held(samples):
+    """Bytes kept alive by `samples`: the whole buffer it is a view of."""
+    return samples.base.nbytes if isinstance(samples.base, np.ndarray) else samples.nbytes
+
+def share(audio_path, samples):
+    """
+    Offer a load_pcm decode of `audio_path` (e.g. one made for VAD before
+    asr transcribes the same file) to later load_pcm calls in this process. Samples must come
+    from load_pcm, so a reused decode gives the same transcript (and cache
+    key) as a fresh one. Kept while the shared decodes fit in
+    AUDIO_SHARE_BYTES, least recently used dropped.
+    """
+    key = _key(audio_path)
+    if key is None:
+        return
+    samples = np.ascontiguousarray(samples, dtype=np.float32).reshape(-1)
+    with _shared_lock:
+        _shared[key] = samples
+        _shared.move_to_end(key)
+        total = sum(_held(a) for a in _shared.values())
+        while total > SHARE_LIMIT and _shared:
+            total -= _held(_shared.popitem(last=False)[1])
+
+def shared(audio_path):
+    """The decode shared for `audio_path` as it is on disk now, or None."""
+    key = _key(audio_path)
+    with _shared_lock:
+        samples = _shared.get(key)
+        if samples is not None:
+            _shared.move_to_end(key)
+        return samples
+
+def forget(audio_path=None):
+    """Drop the shared decode of `audio_path`, or all of them."""
+    with _shared_lock:
+        if audio_path is None:
+            _shared.clear()
+        else:
+            _shared.pop(_key(audio_path), None)
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from audio_decode import iter_pcm, load_pcm, share
+#
+# for block in iter_pcm("/content/movie.mkv"):             # 30 s float32 views, one buffer
+#     feed(block.copy() if keep else block)
+#
+# stats = {}
+# audio = load_pcm("/content/movie.mkv", stats=stats)       # → WhisperModel.transcribe(audio)
+# print(stats)   # audio_seconds, decode_seconds, buffer_bytes, peak_rss_bytes, reused
+#
+# vad_input = load_pcm("/content/1.wav", share_result=True) # a VAD decode of the file asr transcribes next
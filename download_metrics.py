@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import threading
+
+METRICS_FILE = os.environ.get("DOWNLOAD_METRICS_FILE")   # append one JSON line per run
+KEEP_RUNS    = 100                                       # finished runs kept in memory
+
+_runs      = []
+_listeners = []
+_lock      = threading.Lock()
+
+
+# ── events ────────────────────────────────────────────────────────────────────
+
+def subscribe(fn):
+    """Call fn(event) for every finished file ({"event": "file", ...}) and run ({"event": "run", ...})."""
+    with _lock:
+        _listeners.append(fn)
+
+def unsubscribe(fn):
+    with _lock:
+        if fn in _listeners:
+            _listeners.remove(fn)
+
+def _emit(event):
+    with _lock:
+        listeners = list(_listeners)
+    for fn in listeners:
+        try:
+            fn(event)
+        except Exception as e:
+            print(f"⚠️ metrics listener failed: {e}")
+
+
+# ── one download_model call ───────────────────────────────────────────────────
+
+class DownloadRun:
+    """
+    What one download_model call did: a record per file (status, backend,
+    endpoint, bytes, seconds, ttfb, throughput, retries, error) and the run
+    totals from summary(). Finished runs are kept for runs() / to_prometheus().
+    """
+
+    def __init__(self, repo_id, folder, backend, workers, connections):
+        self.info = {
+            "repo_id": repo_id, "folder": folder, "backend": backend, "fallback": None,
+            "workers": workers, "connections": connections, "started": time.time(),
+            "seconds": None, "ok": None,
+        }
+        self.files = []
+        self.lock  = threading.Lock()
+
+    def file(self, name, status, backend=None, seconds=0.0, bytes=0, ttfb=None, retries=0,
+             endpoint=None, error=None):
+        record = {
+            "file": name, "status": status, "backend": backend, "endpoint": endpoint,
+            "bytes": bytes, "seconds": seconds, "ttfb": ttfb,
+            "throughput": bytes / seconds if bytes and seconds else None,
+            "retries": retries, "error": error and str(error),
+        }
+        with self.lock:
+            self.files.append(record)
+        _emit({"event": "file", "repo_id": self.info["repo_id"], **record})
+
+    def finish(self, ok):
+        self.info["seconds"] = time.time() - self.info["started"]
+        self.info["ok"]      = bool(ok)
+        with _lock:
+            _runs.append(self)
+            del _runs[:-KEEP_RUNS]
+        summary = self.summary()
+        _emit({"event": "run", **summary})
+        if METRICS_FILE:
+            with open(METRICS_FILE, "a") as f:
+                f.write(json.dumps(summary) + "\n")
+        return summary
+
+    def summary(self):
+        with self.lock:
+            files = list(self.files)
+        fetched = [f for f in files if f["status"] == "DOWNLOADED"]
+        ttfbs   = [f["ttfb"] for f in fetched if f["ttfb"] is not None]
+        nbytes  = sum(f["bytes"] or 0 for f in fetched)
+        seconds = self.info["seconds"] or (time.time() - self.info["started"])
+        counts  = {}
+        for f in files:
+            counts[f["status"]] = counts.get(f["status"], 0) + 1
+        return {
+            **self.info,
+            "files":      counts,
+            "bytes":      nbytes,
+            "throughput": nbytes / seconds if seconds else None,
+            "ttfb_mean":  sum(ttfbs) / len(ttfbs) if ttfbs else None,
+            "ttfb_max":   max(ttfbs) if ttfbs else None,
+            "retries":    sum(f["retries"] for f in files),
+        }
+
+    def to_json(self, files=True):
+        data = self.summary()
+        if files:
+            with self.lock:
+                data["file_records"] = list(self.files)
+        return json.dumps(data)
+
+
+# ── export ────────────────────────────────────────────────────────────────────
+
+def runs():
+    with _lock:
+        return list(_runs)
+
+def last_run():
+    with _lock:
+        return _runs[-1] if _runs else None
+
+def to_json(files=False):
+    """Every finished run of this process as a JSON list."""
+    return "[" + ",".join(run.to_json(files) for run in runs()) + "]"
+
+def _labels(**labels):
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels.items()) + "}"
+
+def to_prometheus():
+    """
+    Prometheus text format: counters summed over the runs of this process,
+    gauges from the latest run of each repo.
+    """
+    counters, gauges = {}, {}
+    def add(name, value, **labels):
+        key = (name, _labels(**labels))
+        counters[key] = counters.get(key, 0) + value
+
+    for run in runs():
+        s, repo = run.summary(), run.info["repo_id"]
+        add("model_download_runs_total", 1, repo=repo, ok=str(s["ok"]).lower())
+        add("model_download_retries_total", s["retries"], repo=repo)
+        add("model_download_seconds_total", s["seconds"] or 0, repo=repo)
+        if s["fallback"]:
+            add("model_download_fallbacks_total", 1, repo=repo, fallback=s["fallback"])
+        for status, n in s["files"].items():
+            add("model_download_files_total", n, repo=repo, status=status)
+        for f in run.files:
+            if f["status"] == "DOWNLOADED":
+                add("model_download_bytes_total", f["bytes"] or 0, repo=repo, backend=f["backend"])
+        for name, key in (("seconds", "seconds"), ("throughput_bytes", "throughput"),
+                          ("ttfb_seconds", "ttfb_mean")):
+            if s[key] is not None:
+                gauges[(f"model_download_last_{name}", _labels(repo=repo))] = s[key]
+
+    lines = []
+    for kind, metrics in (("counter", counters), ("gauge", gauges)):
+        for name in sorted({n for n, _ in metrics}):
+            lines.append(f"# TYPE {name} {kind}")
+            lines += [f"{n}{labels} {float(value)!r}"
+                      for (n, labels), value in sorted(metrics.items()) if n == name]
+    return "\n".join(lines) + "\n"
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# import download_metrics
+# from downloader import download_model
+#
+# download_model("deepdml/faster-whisper-large-v3-turbo-ct2", "./whisper")
+# print(download_metrics.last_run().summary())        # bytes, seconds, ttfb, retries, backend, ...
+# print(download_metrics.to_prometheus())             # serve this at /metrics
+#
+# download_metrics.subscribe(lambda e: print(e))      # live per-file events
+# Headless services: DOWNLOAD_METRICS_FILE=/var/log/downloads.jsonl, and no
+# progress bars unless DOWNLOAD_PROGRESS=1 (see fast_download.SHOW_PROGRESS).
@@ -8,14 +8,21 @@ Ensures the MMS model files are downloaded into MODELS_DIR.
 """
 
 import os
+import hashlib
 import urllib.request
 import urllib.error
 from tqdm.auto import tqdm
 import sys
 
 
-def download_file(url: str, download_file_path: str, redownload: bool = False) -> bool:
-    """Download a single file with urllib + tqdm progress bar."""
+def download_file(url: str, download_file_path: str, redownload: bool = False,
+                  sha256: str | None = None) -> bool:
+    """
+    Download a single file with urllib + tqdm progress bar (one connection per file).
+
+    If `sha256` is given, the bytes are hashed as they are written and a
+    mismatching file is deleted instead of being left for the model loader.
+    """
     base_path = os.path.dirname(download_file_path)
     os.makedirs(base_path, exist_ok=True)
 
@@ -28,34 +35,42 @@ def download_file(url: str, download_file_path: str, redownload: bool = False) -
             tqdm.write(f"✔️ Skipped (already exists): {os.path.basename(download_file_path)}")
             return True
 
-    # Try fetching metadata
+    # One connection: the response that carries the headers also carries the body
     try:
-        request = urllib.request.urlopen(url)
-        total = int(request.headers.get("Content-Length", 0))
+        response = urllib.request.urlopen(url)
     except urllib.error.URLError as e:
         print(f"❌ Error: Unable to open URL: {url}")
         print(f"Reason: {e.reason}")
         return False
 
     # Download with progress bar
-    with tqdm(
-        total=total,
+    digest = hashlib.sha256()
+    with response, open(download_file_path, "wb") as f, tqdm(
+        total=int(response.headers.get("Content-Length", 0)),
         desc=os.path.basename(download_file_path),
         unit="B",
         unit_scale=True,
         unit_divisor=1024,
     ) as progress:
         try:
-            urllib.request.urlretrieve(
-                url,
-                download_file_path,
-                reporthook=lambda count, block_size, total_size: progress.update(block_size),
-            )
-        except urllib.error.URLError as e:
+            while True:
+                block = response.read(1024 * 1024)
+                if not block:
+                    break
+                f.write(block)
+                digest.update(block)
+                progress.update(len(block))
+        except (urllib.error.URLError, OSError) as e:
             print(f"❌ Error: Failed to download {url}")
-            print(f"Reason: {e.reason}")
+            print(f"Reason: {getattr(e, 'reason', e)}")
             return False
 
+    if sha256 and digest.hexdigest() != sha256.lower():
+        os.remove(download_file_path)
+        print(f"❌ Error: Checksum mismatch for {url}")
+        print(f"Reason: got {digest.hexdigest()}, expected {sha256}")
+        return False
+
     tqdm.write(f"⬇️ Downloaded: {os.path.basename(download_file_path)}")
     return True
 
@@ -0,0 +1,560 @@
+import os
+import re
+import json
+import time
+import shutil
+import tempfile
+import posixpath
+import subprocess
+import http.client
+import importlib.util
+import urllib.error
+import urllib.request
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+import requests
+from tqdm.auto import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fast_download import (MAX_CHUNK, MIN_SPLIT_SIZE, PART_SUFFIX, SHOW_PROGRESS, ChecksumError,
+                           RateLimiter, _discard, _ShortRead, checksum_file, fetch_file, get_session,
+                           throttle)
+from model_cache import CACHE_DIR, blob_key, fetch_blob, get_manifest, mark_verified, verify_file
+from endpoints import PROBE_BYTES, demote, file_urls, ordered, rank
+from file_lock import FileLock, LockTimeout, folder_lock
+from download_metrics import DownloadRun
+
+DEFAULT_BANDWIDTH = 50e6              # bytes/s until a real download has been measured
+PER_CONNECTION    = 10e6              # bytes/s one TCP stream typically gets from the CDN
+REQUEST_OVERHEAD  = 0.15              # s per file: request + time to first byte
+BANDWIDTH_FILE    = os.path.join(CACHE_DIR, "bandwidth.json")
+BACKEND_FILE      = os.path.join(CACHE_DIR, "backend.json")
+BACKEND_TTL       = 7 * 24 * 3600     # s before the backend choice for a host is re-measured
+BENCHMARK_MIN     = 1024 ** 3         # only benchmark unmeasured hosts for jobs this big
+PROBE_MAX         = 64 * 1024 ** 2    # largest file fetched once per backend by a benchmark
+ARIA2_SUFFIX      = ".aria2.part"     # aria2c keeps its own .aria2 control file next to it
+
+# other serialisations of the same weights, dropped when .safetensors exist
+WEIGHT_FORMATS = (".bin", ".pt", ".pth", ".ckpt", ".h5", ".msgpack", ".ot")
+# handy ignore_patterns for repos whose loader needs none of these
+DOCS_PATTERNS  = ["*.md", ".gitattributes", "*.png", "*.jpg", "*.jpeg", "*.gif",
+                  "*.wav", "*.mp3", "*.flac", "*.mp4"]
+
+
+# ── measured link speed ───────────────────────────────────────────────────────
+
+def observed_bandwidth():
+    try:
+        with open(BANDWIDTH_FILE) as f:
+            return json.load(f)["bytes_per_sec"]
+    except Exception:
+        return DEFAULT_BANDWIDTH
+
+def record_bandwidth(nbytes, seconds):
+    # only trust transfers big enough to have left TCP slow start
+    if nbytes < MIN_SPLIT_SIZE or seconds <= 0:
+        return
+    rate = 0.5 * observed_bandwidth() + 0.5 * nbytes / seconds
+    os.makedirs(os.path.dirname(BANDWIDTH_FILE), exist_ok=True)
+    with open(BANDWIDTH_FILE, "w") as f:
+        json.dump({"bytes_per_sec": rate}, f)
+
+
+# ── file selection ────────────────────────────────────────────────────────────
+
+def _patterns(patterns):
+    if patterns is None:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return [p + "*" if p.endswith("/") else p for p in patterns]
+
+def _weights_id(name):
+    # "sub/pytorch_model-00001-of-00002.bin" → ("sub", "model", False, ".bin")
+    folder, base = posixpath.split(name)
+    index = base.endswith(".index.json")
+    if index:
+        base = base[: -len(".index.json")]
+    stem, ext = posixpath.splitext(base)
+    stem = re.sub(r"-\d+-of-\d+$", "", stem)
+    stem = re.sub(r"^(pytorch|tf|flax|rust)_", "", stem)
+    return folder, stem, index, ext
+
+def filter_files(siblings, allow_patterns=None, ignore_patterns=None, prefer_safetensors=True):
+    """
+    Keep the manifest entries the loader needs.
+
+    A file is kept if it matches one of `allow_patterns` (all files when
+    None) and none of `ignore_patterns`; patterns are fnmatch globs on the
+    repo path, as in huggingface_hub ("*.md", "onnx/", ...). With
+    prefer_safetensors, a .bin/.pt/.h5/... file (or its .index.json) is
+    dropped when a .safetensors file with the same name stem sits in the
+    same folder, e.g. pytorch_model-0000x-of-0000y.bin next to
+    model-0000x-of-0000y.safetensors.
+    """
+    allow, ignore = _patterns(allow_patterns), _patterns(ignore_patterns)
+    kept = [
+        s for s in siblings
+        if (allow is None or any(fnmatch(s["rfilename"], p) for p in allow))
+        and not (ignore and any(fnmatch(s["rfilename"], p) for p in ignore))
+    ]
+    if not prefer_safetensors:
+        return kept
+
+    ids = [_weights_id(s["rfilename"]) for s in kept]
+    safetensors = {(folder, stem, index) for folder, stem, index, ext in ids if ext == ".safetensors"}
+    return [
+        s for s, (folder, stem, index, ext) in zip(kept, ids)
+        if not (ext in WEIGHT_FORMATS and (folder, stem, index) in safetensors)
+    ]
+
+
+# ── scheduling ────────────────────────────────────────────────────────────────
+
+def predict_finish(sizes, workers, connections=8, bandwidth=None):
+    """
+    Seconds to fetch files of `sizes` in the given order with `workers`
+    files in flight. Every open connection gets an equal share of the link,
+    but no more than PER_CONNECTION; a big file holds `connections` Range
+    parts and a small one a single stream. So a big shard started late runs
+    alone at the end, capped at connections × PER_CONNECTION.
+    """
+    rate    = bandwidth or observed_bandwidth()
+    queue   = [max(0, s or 0) for s in sizes]
+    active  = []                                     # [remaining bytes, connections]
+    elapsed = 0.0
+    while queue or active:
+        while queue and len(active) < workers:
+            size = queue.pop(0)
+            active.append([size, max(1, min(connections, size // MIN_SPLIT_SIZE))])
+        per_conn = min(PER_CONNECTION, rate / sum(c for _, c in active))
+        step = min(rem / (per_conn * c) for rem, c in active)
+        elapsed += step
+        for a in active:
+            a[0] -= step * per_conn * a[1]
+        active = [a for a in active if a[0] > 1e-6]
+    rounds = -(-len(sizes) // max(1, workers))
+    return elapsed + rounds * REQUEST_OVERHEAD
+
+def _pending(sibling, download_dir):
+    if download_dir is None or sibling.get("size") is None:
+        return True
+    path = os.path.join(download_dir, sibling["rfilename"])
+    return not (os.path.exists(path) and os.path.getsize(path) == sibling["size"])
+
+def schedule(siblings, workers, connections=8, download_dir=None, bandwidth=None):
+    """
+    Order manifest entries largest-first so the big shards start at once
+    and the small configs/tokenizers fill the remaining worker slots,
+    instead of a 1.6 GB model.bin listed last starting when everything
+    else is done. Returns (ordered siblings, predicted seconds); files
+    already complete in `download_dir` are left out of the prediction.
+    """
+    ordered = sorted(siblings, key=lambda s: s.get("size") or 0, reverse=True)
+    sizes   = [s.get("size") or 0 for s in ordered if _pending(s, download_dir)]
+    return ordered, predict_finish(sizes, workers, connections, bandwidth)
+
+
+# ── file backends ─────────────────────────────────────────────────────────────
+# Every backend is fetch(url, path, connections, resume, desc, checksum, stats, limiter)
+# → bytes in the file. It only puts `path` in place once complete and, when
+# given a checksum (model_cache.blob_key), matching; otherwise it raises.
+# `stats` gets "bytes" transferred, "ttfb" and "retries" where known.
+
+def _verify(tmp, checksum, desc):
+    if checksum and not checksum_file(tmp, checksum):
+        os.remove(tmp)
+        raise ChecksumError(f"checksum mismatch for {desc}")
+
+def fetch_requests(url, path, connections=8, resume=True, desc=None, checksum=None, stats=None,
+                   limiter=None):
+    """Segmented Range download on the shared requests session (fast_download)."""
+    return fetch_file(url, path, connections=connections, resume=resume, desc=desc, checksum=checksum,
+                      stats=stats, limiter=limiter)
+
+def fetch_urllib(url, path, connections=8, resume=True, desc=None, checksum=None, stats=None,
+                 limiter=None):
+    """One connection, standard library only; resumes <path>.part by appending."""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    desc = desc or os.path.basename(path)
+    part = path + PART_SUFFIX
+    if not resume or os.path.exists(part + ".json"):
+        _discard(part)                               # preallocated by fetch_requests: not appendable
+    start = os.path.getsize(part) if os.path.exists(part) else 0
+
+    stats = {} if stats is None else stats
+    headers = {"Range": f"bytes={start}-"} if start else {}
+    t0 = time.perf_counter()
+    try:
+        r = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=60)
+    except urllib.error.HTTPError as e:
+        if e.code != 416:
+            raise
+        start = 0                                    # .part already longer than the file
+        r = urllib.request.urlopen(url, timeout=60)
+    if r.status != 206:
+        start = 0
+    stats.update(bytes=0, ttfb=time.perf_counter() - t0, retries=0)
+
+    with r, open(part, "ab" if start else "wb") as f, tqdm(
+        total=start + int(r.headers.get("Content-Length", 0)), initial=start,
+        unit="B", unit_scale=True, desc=desc, leave=False, disable=not SHOW_PROGRESS,
+    ) as pbar:
+        while True:
+            block = r.read(MAX_CHUNK)
+            if not block:
+                break
+            f.write(block)
+            pbar.update(len(block))
+            stats["bytes"] += len(block)
+            throttle(len(block), limiter)
+
+    _verify(part, checksum, desc)
+    os.replace(part, path)
+    return os.path.getsize(path)
+
+def fetch_aria2c(url, path, connections=8, resume=True, desc=None, checksum=None, stats=None,
+                 limiter=None):
+    """
+    aria2c subprocess, up to 16 connections per file; resumes via its .aria2
+    file. Not shaped by set_max_bandwidth or `limiter`: aria2c paces itself.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    desc = desc or os.path.basename(path)
+    part = path + ARIA2_SUFFIX
+    if not resume:
+        for leftover in (part, part + ".aria2"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    before = os.path.getsize(part) if os.path.exists(part + ".aria2") else 0
+
+    n = str(max(1, min(16, connections)))
+    result = subprocess.run(
+        ["aria2c", "--console-log-level=error", "--summary-interval=0", "--allow-overwrite=true",
+         "--auto-file-renaming=false", "-c", "-x", n, "-s", n, "-k", "1M",
+         "-d", parent, "-o", os.path.basename(part), url],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise IOError(f"aria2c failed for {desc}: {result.stderr.strip() or result.returncode}")
+
+    _verify(part, checksum, desc)
+    os.replace(part, path)
+    size = os.path.getsize(path)
+    if stats is not None:
+        stats.update(bytes=size - before, ttfb=None, retries=0)
+    return size
+
+FILE_BACKENDS = {
+    "requests": fetch_requests,
+    "urllib":   fetch_urllib,
+    "aria2c":   fetch_aria2c,
+}
+
+def available_backends():
+    """Backends usable on this machine; "snapshot" works on whole repos only."""
+    names = ["requests", "urllib"]
+    if shutil.which("aria2c"):
+        names.append("aria2c")
+    if importlib.util.find_spec("huggingface_hub"):
+        names.append("snapshot")
+    return names
+
+
+# ── strategy ──────────────────────────────────────────────────────────────────
+
+def _measurements():
+    try:
+        with open(BACKEND_FILE) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def benchmark_backends(url, connections=8, backends=None):
+    """
+    Download `url` once with every available file backend and remember the
+    fastest for its host. Returns {backend: bytes per second}.
+    """
+    names = [b for b in (backends or available_backends()) if b in FILE_BACKENDS]
+    rates = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            t = time.perf_counter()
+            try:
+                nbytes = FILE_BACKENDS[name](url, os.path.join(tmp, name), connections, resume=False,
+                                             desc=f"benchmark {name}")
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+                continue
+            rates[name] = nbytes / max(time.perf_counter() - t, 1e-6)
+            print(f"⏱ {name:<8} {rates[name] / 1e6:8.1f} MB/s")
+    if rates:
+        db = _measurements()
+        db[urlparse(url).netloc] = {"backend": max(rates, key=rates.get), "rates": rates,
+                                    "measured": time.time()}
+        os.makedirs(os.path.dirname(BACKEND_FILE), exist_ok=True)
+        with open(BACKEND_FILE, "w") as f:
+            json.dump(db, f)
+    return rates
+
+def select_backend(host=None, probe_url=None, connections=8, max_age=BACKEND_TTL):
+    """
+    The file backend to use for `host` (default: the fastest endpoint): the
+    last benchmark winner if younger than `max_age` and still installed,
+    else a fresh benchmark on `probe_url` when one is given, else "requests".
+    """
+    available = available_backends()
+    last = _measurements().get(host or urlparse(ordered()[0]).netloc)
+    if last and time.time() - last["measured"] < max_age and last["backend"] in available:
+        return last["backend"]
+    if probe_url:
+        rates = benchmark_backends(probe_url, connections, available)
+        if rates:
+            return max(rates, key=rates.get)
+    return "requests"
+
+def _choose(backend, siblings, repo_id, download_dir, connections):
+    if backend in FILE_BACKENDS:
+        if backend in available_backends():
+            return backend
+        print(f"⚠️ {backend} is not installed → choosing automatically")
+    # a benchmark costs a few small files; only worth it when much more is to come
+    pending = [s for s in siblings if _pending(s, download_dir)]
+    probes  = [s for s in pending if MIN_SPLIT_SIZE <= (s.get("size") or 0) <= PROBE_MAX]
+    big_job = sum(s.get("size") or 0 for s in pending) >= BENCHMARK_MIN
+    probe   = min(probes, key=lambda s: s["size"]) if probes and (big_job or backend == "benchmark") else None
+    return select_backend(
+        urlparse(ordered()[0]).netloc,
+        probe and file_urls(repo_id, probe["rfilename"])[0],
+        connections,
+        max_age=0 if backend == "benchmark" else BACKEND_TTL,
+    )
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def _endpoint_error(e):
+    """Whether `e` is the endpoint's fault (network, HTTP, bad bytes), so another mirror may succeed."""
+    if isinstance(e, LockTimeout):
+        return False
+    if isinstance(e, (requests.RequestException, urllib.error.URLError, http.client.HTTPException,
+                      ChecksumError, _ShortRead, ConnectionError, TimeoutError)):
+        return True
+    # backends raise errno-less IOErrors for bad replies; ENOSPC, EACCES, ... are this machine's
+    return not isinstance(e, OSError) or e.errno is None
+
+def download_file(url, path, backend="requests", redownload=False, connections=8, key=None,
+                  size=None, checksum=None, stats=None, limiter=None):
+    """
+    Fetch one file with a file backend. A file already on disk is kept when
+    its size matches `size` and its content `checksum`; with `key` it comes
+    from the shared blob store (model_cache). `url` may be a list of mirror
+    URLs (endpoints.file_urls): when one fails, even mid-transfer, the next
+    resumes the same .part and the failed endpoint is demoted. Local errors
+    (disk full, permissions, lock timeout) are raised, not retried. Returns
+    (status, message), status being "SKIPPED", "CACHED", "DOWNLOADED" or
+    "FAILED"; `stats` gets the fields of DownloadRun.file. `limiter` (a
+    fast_download.RateLimiter) caps the run this file belongs to.
+    """
+    name  = os.path.basename(path)
+    stats = {} if stats is None else stats
+    stats.update(backend=backend, endpoint=None, bytes=0, ttfb=None, retries=0, error=None)
+    start = time.perf_counter()
+    with FileLock(path, quiet=True):                 # one process per file; the rest find it done
+        if not redownload and os.path.exists(path):
+            local_size = os.path.getsize(path)
+            if local_size > 0 and (size is None or local_size == size):
+                if not checksum or verify_file(path, checksum):
+                    stats["seconds"] = time.perf_counter() - start
+                    return "SKIPPED", f"✔️ Skipped: {name}"
+
+        fetch = FILE_BACKENDS[backend]
+        urls  = [url] if isinstance(url, str) else list(url)
+        error = "no URL to download from"
+        for i, u in enumerate(urls):
+            fresh = redownload and i == 0            # later mirrors continue the .part
+            got   = {}
+            stats["endpoint"] = urlparse(u).netloc
+            try:
+                if key:                              # content-addressed: shared across folders
+                    status = fetch_blob(u, key, path, fresh, connections, fetch, got, limiter)
+                else:
+                    fetch(u, path, connections=connections, resume=not fresh, checksum=checksum, stats=got,
+                          limiter=limiter)
+                    if checksum:
+                        mark_verified(path, checksum)
+                    status = "DOWNLOADED"
+            except Exception as e:
+                if not _endpoint_error(e):           # no mirror fixes a full disk
+                    raise
+                error = e
+                demote(u)
+                stats["retries"] += got.get("retries", 0) + 1
+                if i + 1 < len(urls):
+                    print(f"⚠️ {name}: {urlparse(u).netloc} failed ({e}) → {urlparse(urls[i + 1]).netloc}")
+                continue
+            stats.update(bytes=got.get("bytes", 0), ttfb=got.get("ttfb"),
+                         retries=stats["retries"] + got.get("retries", 0),
+                         seconds=time.perf_counter() - start)
+            if status == "CACHED":
+                return "CACHED", f"🔗 Linked from cache: {name}"
+            return "DOWNLOADED", f"⬇️ Downloaded: {name}"
+
+        stats.update(seconds=time.perf_counter() - start, error=str(error))
+        return "FAILED", f"❌ Failed: {name} ({error})"
+
+def _fetch_all(run, repo_id, siblings, download_dir, backend, redownload, workers, connections,
+               use_cache, max_bandwidth=None):
+    start = time.time()
+    get_session(workers * connections)               # keep-alive pool for every worker
+    # largest first: the big shard must not start last and set the wall-clock time
+    siblings, eta = schedule(siblings, workers, connections,
+                             download_dir=None if redownload else download_dir)
+    print(f"🚀 {backend} | {len(siblings)} files | workers={workers} | ~{eta:.0f}s predicted")
+
+    counts, nbytes = {}, 0
+    # this run's own bucket: concurrent runs keep their caps, the process-wide one still applies
+    limiter = RateLimiter(max_bandwidth) if max_bandwidth else None
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {}
+        for s in siblings:
+            stats = {}
+            futures[ex.submit(
+                download_file,
+                file_urls(repo_id, s["rfilename"]),
+                os.path.join(download_dir, s["rfilename"]),
+                backend,
+                redownload,
+                connections,
+                blob_key(s) if use_cache else None,
+                s.get("size"),
+                blob_key(s),
+                stats,
+                limiter,
+            )] = (s, stats)
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Overall",
+                           disable=not SHOW_PROGRESS):
+            status, msg = future.result()
+            sibling, stats = futures[future]
+            run.file(sibling["rfilename"], status, **stats)
+            counts[status] = counts.get(status, 0) + 1
+            if status in ("DOWNLOADED", "FAILED"):
+                print(msg)
+            if status == "DOWNLOADED":
+                nbytes += stats["bytes"]
+
+    if not max_bandwidth:                            # a capped run says nothing about the link
+        record_bandwidth(nbytes, time.time() - start)
+    print(f"📊 {counts.get('DOWNLOADED', 0)} downloaded | {counts.get('CACHED', 0)} cached | "
+          f"{counts.get('SKIPPED', 0)} skipped | {counts.get('FAILED', 0)} failed")
+    return counts.get("FAILED", 0)
+
+def _snapshot(repo_id, download_dir, wanted, allow_patterns, ignore_patterns, redownload):
+    try:
+        from huggingface_hub import snapshot_download
+        print("🚀 snapshot_download ...")
+        snapshot_download(
+            repo_id=repo_id,
+            endpoint=ordered()[0],
+            local_dir=download_dir,
+            local_dir_use_symlinks=False,
+            resume_download=not redownload,
+            # the filtered selection; the raw patterns if the manifest never loaded
+            allow_patterns=[s["rfilename"] for s in wanted] if wanted is not None else allow_patterns,
+            ignore_patterns=None if wanted is not None else ignore_patterns,
+        )
+        return True
+    except Exception as e:
+        print(f"⚠️ snapshot_download failed: {e}")
+        return False
+
+def download_model(repo_id, download_folder="./", redownload=False, workers=6, connections=8,
+                   backend="auto", fallback=True, use_cache=True, allow_patterns=None,
+                   ignore_patterns=None, prefer_safetensors=True, max_bandwidth=None):
+    """
+    Download a Hugging Face repo into `download_folder`; the one implementation
+    behind asr, hf_mirror, hf_hub, hf_downloader, hf_model_download and
+    model_download.
+
+    The file list comes from the cached manifest (model_cache.get_manifest),
+    is narrowed by filter_files and fetched largest-first by `workers`
+    threads from the fastest endpoint (endpoints.py), failing over to the
+    others file by file. `backend` is a FILE_BACKENDS name, "snapshot"
+    (huggingface_hub.snapshot_download), "auto" (the benchmark winner for
+    the fastest endpoint, measured on large jobs if unknown) or "benchmark"
+    (measure now). With `fallback`, a failed file backend is followed by
+    snapshot_download and a failed snapshot by the file backends.
+    `max_bandwidth` (bytes/s) caps all workers together for this call.
+    What happened (bytes, TTFB, retries, backend, fallback, per file) is
+    recorded in download_metrics.
+
+    Returns the folder, or None if some file could not be fetched.
+    """
+    download_dir = os.path.abspath(download_folder)
+    os.makedirs(download_dir, exist_ok=True)
+    print(f"📂 {download_dir}")
+
+    run = DownloadRun(repo_id, download_dir, backend, workers, connections)
+    # a second process asking for the same folder waits, then finds every file in place
+    with folder_lock(download_dir):
+        ok = _download(run, repo_id, download_dir, redownload, workers, connections, backend, fallback,
+                       use_cache, allow_patterns, ignore_patterns, prefer_safetensors, max_bandwidth)
+    summary = run.finish(ok)
+    if not SHOW_PROGRESS:
+        print(f"📈 {json.dumps(summary)}")           # headless: one machine-readable line per run
+    if not ok:
+        print("❌ Download incomplete")
+        return None
+    print(f"✅ Done  ⏱ {summary['seconds']:.1f}s")
+    return download_dir
+
+def _download(run, repo_id, download_dir, redownload, workers, connections, backend, fallback,
+              use_cache, allow_patterns, ignore_patterns, prefer_safetensors, max_bandwidth):
+    try:
+        manifest = get_manifest(repo_id)["siblings"]
+        wanted   = filter_files(manifest, allow_patterns, ignore_patterns, prefer_safetensors)
+        if len(wanted) < len(manifest):
+            print(f"🧹 {len(manifest) - len(wanted)} files filtered out")
+    except Exception as e:
+        wanted = None
+        print(f"⚠️ Could not list repo files: {e}")
+
+    snapshot = lambda: _snapshot(repo_id, download_dir, wanted, allow_patterns, ignore_patterns, redownload)
+    if backend == "snapshot":
+        if snapshot():
+            return True
+        if not fallback:
+            return False
+        run.info["fallback"] = "files"
+
+    if wanted is not None:
+        pending = [s for s in wanted if _pending(s, None if redownload else download_dir)]
+        if pending:                                  # sticky: probed at most once per RANK_TTL
+            sized = [s for s in pending if (s.get("size") or 0) >= PROBE_BYTES]
+            probe = min(sized or pending, key=lambda s: s.get("size") or 0)
+            rank(f"{repo_id}/resolve/main/{probe['rfilename']}")
+        name = _choose(backend, wanted, repo_id, None if redownload else download_dir, connections)
+        run.info["backend"] = name if backend != "snapshot" else backend
+        if _fetch_all(run, repo_id, wanted, download_dir, name, redownload, workers, connections,
+                      use_cache, max_bandwidth) == 0:
+            return True
+
+    if fallback and backend != "snapshot" and "snapshot" in available_backends():
+        print("⚠️ Falling back to snapshot_download")
+        run.info["fallback"] = "snapshot"
+        return snapshot()
+    return False
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from downloader import DOCS_PATTERNS, benchmark_backends, download_model
+#
+# download_model("deepdml/faster-whisper-large-v3-turbo-ct2", "./whisper")                 # auto
+# download_model("IndexTeam/IndexTTS-2", "./IndexTTS-2", backend="aria2c",
+#                ignore_patterns=DOCS_PATTERNS)
+# download_model("IndexTeam/IndexTTS-2", "./IndexTTS-2", backend="benchmark")  # re-measure now
+#
+# # compare backends on one file without downloading a repo
+# benchmark_backends("https://huggingface.co/deepdml/faster-whisper-large-v3-turbo-ct2/resolve/main/config.json")
@@ -0,0 +1,117 @@
+import os
+import time
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from fast_download import CHUNK_SIZE, http_get
+
+# Hugging Face and its copies: an internal mirror, a local file server, ...
+# Every endpoint serves the hub's layout: {endpoint}/{repo}/resolve/{revision}/{file}
+# and {endpoint}/api/models/{repo}/revision/{revision}.
+DEFAULT_ENDPOINT = "https://huggingface.co"
+ENDPOINTS = [
+    e.strip().rstrip("/")
+    for e in os.environ.get("HF_ENDPOINTS", os.environ.get("HF_ENDPOINT", DEFAULT_ENDPOINT)).split(",")
+    if e.strip()
+] or [DEFAULT_ENDPOINT]                 # HF_ENDPOINTS="" means the default, not no endpoint
+PROBE_BYTES  = 1024 * 1024           # read from every endpoint to rank them
+TYPICAL_FILE = 1024 * 1024 * 32     # ranking score: seconds to fetch a file this big
+RANK_TTL     = 600.0               # seconds a ranking sticks before endpoints are re-probed
+
+
+# ── ranking ───────────────────────────────────────────────────────────────────
+
+_order  = list(ENDPOINTS)
+_ranked = 0.0
+_lock   = threading.Lock()
+
+def set_endpoints(endpoints):
+    """Replace the endpoint list (in preference order) and forget the last ranking."""
+    global _order, _ranked
+    with _lock:
+        _order  = [e.rstrip("/") for e in endpoints if e.strip()] or [DEFAULT_ENDPOINT]
+        _ranked = 0.0
+
+def ordered():
+    """Endpoints, fastest known first."""
+    with _lock:
+        return list(_order)
+
+def demote(url):
+    """Move the endpoint of `url` (a file URL or the endpoint itself), which just failed, to the back."""
+    with _lock:
+        for endpoint in _order:
+            if url == endpoint or url.startswith(endpoint + "/"):
+                _order.remove(endpoint)
+                _order.append(endpoint)
+                return
+
+def probe(url, nbytes=PROBE_BYTES, timeout=10):
+    """
+    (seconds to first byte, bytes/s) for the first `nbytes` of `url`, or
+    None if the endpoint can't serve it.
+    """
+    start = time.perf_counter()
+    try:
+        with http_get(url, headers={"Range": f"bytes=0-{nbytes - 1}"}, timeout=timeout) as r:
+            r.raise_for_status()
+            received, ttfb = 0, None
+            for chunk in r.iter_content(CHUNK_SIZE):
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+                received += len(chunk)
+                if received >= nbytes:               # a server ignoring Range sends it all
+                    break
+    except Exception:
+        return None
+    elapsed = time.perf_counter() - start
+    ttfb    = elapsed if ttfb is None else ttfb
+    return ttfb, received / max(elapsed - ttfb, 1e-3)
+
+def rank(path, force=False):
+    """
+    Probe every endpoint for `path` (e.g. "org/repo/resolve/main/config.json")
+    in parallel and make the order stick: fastest expected time for a
+    TYPICAL_FILE first, unreachable ones last. Re-probed after RANK_TTL or
+    with force=True; with a single endpoint nothing is probed.
+    """
+    global _order, _ranked
+    endpoints = ordered()
+    if len(endpoints) < 2 or (not force and time.time() - _ranked < RANK_TTL):
+        return endpoints
+
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as ex:
+        results = list(ex.map(lambda e: probe(f"{e}/{path}"), endpoints))
+
+    score = {
+        e: (res[0] + TYPICAL_FILE / res[1]) if res else float("inf")
+        for e, res in zip(endpoints, results)
+    }
+    for e, res in zip(endpoints, results):
+        if res:
+            print(f"📡 {urlsplit(e).netloc:<30} {res[0] * 1000:6.0f} ms  {res[1] / 1e6:8.1f} MB/s")
+        else:
+            print(f"📡 {urlsplit(e).netloc:<30} unreachable")
+
+    with _lock:
+        _order  = sorted(endpoints, key=lambda e: score[e])    # stable: ties keep config order
+        _ranked = time.time()
+        return list(_order)
+
+def file_urls(repo_id, filename, revision="main"):
+    """URLs of one repo file on every endpoint, fastest first."""
+    return [f"{e}/{repo_id}/resolve/{revision}/{filename}" for e in ordered()]
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# Nearest copy first, Hugging Face as the last resort:
+#   HF_ENDPOINTS=http://10.0.0.5:8080,https://hf-mirror.example.com,https://huggingface.co
+#
+# or at runtime, before the first download:
+#   import endpoints
+#   endpoints.set_endpoints(["http://127.0.0.1:8000", "https://huggingface.co"])
+#   endpoints.rank("deepdml/faster-whisper-large-v3-turbo-ct2/resolve/main/config.json")
+#
+# A file server works as a mirror if it serves a copy of the repo at
+# <root>/<org>/<repo>/resolve/main/... and the listing at
+# <root>/api/models/<org>/<repo>/revision/main (the JSON from huggingface.co).
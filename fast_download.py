@@ -0,0 +1,657 @@
+import os
+import sys
+import json
+import time
+import errno
+import hashlib
+import threading
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+from tqdm.auto import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+CHUNK_SIZE     = 1024 * 64           # first read of every stream; grows up to MAX_CHUNK
+MAX_CHUNK      = 1024 * 1024 * 8
+MIN_SPLIT_SIZE = 1024 * 1024 * 8     # never cut a file into parts smaller than this
+PART_SUFFIX    = ".part"             # bytes in flight: <file>.part
+STATE_SUFFIX   = ".json"             # resume sidecar:  <file>.part.json
+SAVE_EVERY     = 1.0                 # seconds between sidecar writes
+MAX_PER_HOST   = int(os.environ.get("DOWNLOAD_MAX_PER_HOST", 32))   # open requests per host
+RETRIES        = 5                   # per request: 429/5xx/connect errors, and per range part
+BACKOFF        = 0.5                 # seconds, doubled on every retry
+MAX_BANDWIDTH  = float(os.environ.get("DOWNLOAD_MAX_BANDWIDTH", 0)) or None   # bytes/s, whole process
+DROP_CACHE     = os.environ.get("DOWNLOAD_DROP_CACHE") == "1"   # keep downloads out of the page cache
+DROP_EVERY     = 1024 * 1024 * 32    # bytes written between page cache drops
+# progress bars only where someone watches: a terminal or a notebook (DOWNLOAD_PROGRESS=0/1 to force)
+SHOW_PROGRESS  = {"0": False, "1": True}.get(
+    os.environ.get("DOWNLOAD_PROGRESS"), sys.stderr.isatty() or "ipykernel" in sys.modules
+)
+
+
+# ── shared session ────────────────────────────────────────────────────────────
+
+_session      = None
+_session_pool = 0
+_session_lock = threading.Lock()
+_host_slots   = {}
+
+def get_session(pool_size=MAX_PER_HOST):
+    """
+    The process-wide requests.Session used by every downloader.
+
+    Connections are kept alive and pooled per host, so the 50 small files of
+    a repo reuse a handful of TLS connections instead of a handshake each.
+    The pool grows to `pool_size` (workers × connections) but never beyond
+    MAX_PER_HOST, since no host ever gets more requests than that at once.
+    429/5xx replies and connection errors are retried with backoff.
+    """
+    global _session, _session_pool
+    pool_size = max(1, min(pool_size, MAX_PER_HOST))
+    with _session_lock:
+        if _session is None or pool_size > _session_pool:
+            retry = Retry(
+                total=RETRIES, backoff_factor=BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET", "HEAD"), respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, max_retries=retry)
+            session = _session or requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session, _session_pool = session, pool_size
+        return _session
+
+def _host_slot(url):
+    host = urlsplit(url).netloc
+    with _session_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(MAX_PER_HOST)
+        return _host_slots[host]
+
+def http_get(url, headers=None, timeout=60, stream=True):
+    """
+    GET through the shared session, holding one of the host's MAX_PER_HOST
+    slots until the response is closed.
+    """
+    slot = _host_slot(url)
+    slot.acquire()
+    try:
+        r = get_session().get(url, headers=headers, stream=stream, timeout=timeout)
+    except Exception:
+        slot.release()
+        raise
+
+    close, released = r.close, []
+    def _close():
+        try:
+            close()
+        finally:
+            if not released:
+                released.append(True)
+                slot.release()
+    r.close = _close
+    if not stream:
+        r.close()
+    return r
+
+
+# ── bandwidth ─────────────────────────────────────────────────────────────────
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread: each chunk takes its size in tokens
+    and a thread that runs the bucket into debt sleeps until it's paid back,
+    so N workers together stay at `rate` bytes/s. rate=None means unlimited.
+    """
+
+    def __init__(self, rate=None, burst=1.0):
+        self.rate   = rate
+        self.burst  = burst                          # seconds of traffic allowed in one go
+        self.tokens = 0.0
+        self.stamp  = time.monotonic()
+        self.lock   = threading.Lock()
+
+    def reserve(self, n):
+        """Take n tokens; returns the seconds to wait before sending them (sleep outside the lock)."""
+        with self.lock:
+            if not self.rate:
+                return 0.0
+            now = time.monotonic()
+            self.tokens = min(self.rate * self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp  = now
+            self.tokens -= n
+            return max(0.0, -self.tokens / self.rate)
+
+    def consume(self, n):
+        wait = self.reserve(n)
+        if wait > 0:
+            time.sleep(wait)
+
+_limiter = RateLimiter(MAX_BANDWIDTH)
+
+def set_max_bandwidth(bytes_per_sec):
+    """Cap all downloads of this process together (None: no cap). Returns the old cap."""
+    with _limiter.lock:
+        old, _limiter.rate = _limiter.rate, bytes_per_sec or None
+        _limiter.tokens, _limiter.stamp = 0.0, time.monotonic()
+    return old
+
+def reserve(nbytes, limiter=None):
+    """
+    Take `nbytes` from the process-wide cap and from `limiter` (one run's
+    own cap), if given; returns the seconds to wait before sending them,
+    for callers that sleep on an event loop (async_download).
+    """
+    return max(_limiter.reserve(nbytes), limiter.reserve(nbytes) if limiter is not None else 0.0)
+
+def throttle(nbytes, limiter=None):
+    """reserve(), then sleep until the bytes are paid for."""
+    wait = reserve(nbytes, limiter)
+    if wait > 0:
+        time.sleep(wait)
+
+def _chunks(r, chunk_size=CHUNK_SIZE, limiter=None):
+    """
+    r.iter_content with an adaptive read size: doubled while reads fill
+    within 20 ms (the link outruns us, so fewer, bigger writes and progress
+    updates), halved when one takes over 200 ms, within chunk_size..MAX_CHUNK.
+    """
+    size = chunk_size
+    rates = [l.rate for l in (_limiter, limiter) if l is not None and l.rate]
+    while True:
+        t = time.perf_counter()
+        try:
+            chunk = r.raw.read(size, decode_content=True)
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except ReadTimeoutError as e:
+            raise requests.ConnectionError(e)
+        except DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        if not chunk:
+            return
+        elapsed = time.perf_counter() - t
+        throttle(len(chunk), limiter)                # before yield: the caller may stop after it
+        yield chunk
+        if len(chunk) == size and elapsed < 0.02:
+            # under a cap, no chunk bigger than 50 ms of the budget, so waits stay short and fair
+            limit = min(MAX_CHUNK, max(chunk_size, int(min(rates) / 20))) if rates else MAX_CHUNK
+            size  = min(size * 2, limit)
+        elif elapsed > 0.2:
+            size = max(size // 2, chunk_size)
+
+
+# ── positional I/O ────────────────────────────────────────────────────────────
+
+_seek_lock = threading.Lock()
+
+def _pread(fd, size, offset):
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    with _seek_lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+def _pwrite(fd, data, offset):
+    if hasattr(os, "pwrite"):
+        while data:
+            n = os.pwrite(fd, data, offset)
+            data, offset = data[n:], offset + n
+        return
+    with _seek_lock:                                 # Windows: no pwrite
+        os.lseek(fd, offset, os.SEEK_SET)
+        while data:
+            data = data[os.write(fd, data):]
+
+def _allocate(fd, total):
+    # real blocks up front: no fragmentation from parallel parts, and a full
+    # disk fails now instead of at 97 %
+    if total and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, total)
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.ENOSYS, errno.EINVAL):
+                raise
+
+def _open_prealloc(path, total, keep=False):
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    if not keep:
+        flags |= os.O_TRUNC
+    fd = os.open(path, flags, 0o644)
+    try:
+        os.ftruncate(fd, total)
+        _allocate(fd, total)
+    except Exception:
+        os.close(fd)
+        raise
+    return fd
+
+def _drop_cache(fd, offset=0, length=0, sync=False):
+    # POSIX_FADV_DONTNEED starts writeback of dirty pages and evicts the
+    # clean ones, so advising each window twice (once as it's written, once
+    # a window later) keeps a download from pushing live models out of RAM
+    if not hasattr(os, "posix_fadvise"):
+        return
+    if sync:
+        os.fdatasync(fd)
+    os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+
+
+# ── resume state ──────────────────────────────────────────────────────────────
+
+def _merge(ranges):
+    merged = []
+    for s, e in sorted(ranges):
+        if merged and s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return merged
+
+def _missing(done, total):
+    gaps, pos = [], 0
+    for s, e in _merge(done):
+        if s > pos:
+            gaps.append((pos, s))
+        pos = max(pos, e)
+    if pos < total:
+        gaps.append((pos, total))
+    return gaps
+
+def _load_state(part):
+    try:
+        with open(part + STATE_SUFFIX) as f:
+            state = json.load(f)
+        if os.path.getsize(part) == state["size"]:
+            return state
+    except Exception:
+        pass
+    return None
+
+def _discard(part):
+    for p in (part, part + STATE_SUFFIX):
+        if os.path.exists(p):
+            try: os.remove(p)
+            except Exception: pass
+
+
+# ── checksums ─────────────────────────────────────────────────────────────────
+
+class ChecksumError(IOError):
+    pass
+
+def _hasher(checksum, size):
+    # checksum uses the blob key format of model_cache.blob_key:
+    # "<sha256 hex>" for LFS files, "git-<sha1 hex>" for git blobs
+    if checksum.startswith("git-"):
+        h = hashlib.sha1()
+        h.update(b"blob %d\0" % size)
+        return h, checksum[4:]
+    return hashlib.sha256(), checksum
+
+def checksum_file(path, checksum):
+    """Hash `path` in the format of `checksum` and return True if it matches."""
+    h, expected = _hasher(checksum, os.path.getsize(path))
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024 * 4), b""):
+            h.update(block)
+    return h.hexdigest() == expected
+
+
+class _StreamingHash:
+    """
+    Hash of a file whose parts arrive out of order, computed while it downloads.
+
+    A chunk that lands on the hash frontier is hashed straight from the
+    network buffer. Chunks beyond it (other Range parts, or bytes already in
+    a resumed .part file) are only noted, and hashed by reading them back
+    through the page cache once the gap before them has been filled, so the
+    finished file is never read a second time.
+    """
+
+    def __init__(self, checksum, size, fd=None, done=()):
+        self.h, self.expected = _hasher(checksum, size)
+        self.fd       = fd
+        self.frontier = 0
+        self.ahead    = _merge(done)
+        self.lock     = threading.Lock()
+
+    def update(self, offset, data):
+        with self.lock:
+            if offset == self.frontier:
+                self.h.update(data)
+                self.frontier += len(data)
+            else:
+                self.ahead = _merge(self.ahead + [[offset, offset + len(data)]])
+            self._drain()
+
+    def _drain(self):
+        while self.ahead and self.ahead[0][0] <= self.frontier:
+            _, end = self.ahead.pop(0)
+            while self.frontier < end:
+                block = _pread(self.fd, min(end - self.frontier, 1024 * 1024 * 4), self.frontier)
+                self.h.update(block)
+                self.frontier += len(block)
+
+    def check(self, desc):
+        with self.lock:
+            self._drain()
+            digest = self.h.hexdigest()
+        if digest != self.expected:
+            raise ChecksumError(f"checksum mismatch for {desc}: got {digest}, expected {self.expected}")
+
+
+class _RangeTracker:
+    """Keeps the sidecar of a .part file in step with the bytes on disk."""
+
+    def __init__(self, part, url, etag, size, done, hasher=None):
+        self.path   = part + STATE_SUFFIX
+        self.head   = {"url": url, "etag": etag, "size": size}
+        self.done   = [list(r) for r in done]
+        self.active = {}
+        self.hasher = hasher
+        self.lock   = threading.Lock()
+        self.saved  = 0.0
+        self.retries = 0
+
+    def advance(self, start, offset, chunk):
+        if self.hasher is not None:
+            self.hasher.update(offset - len(chunk), chunk)
+        with self.lock:
+            self.active[start] = offset
+            if time.time() - self.saved >= SAVE_EVERY:
+                self._save()
+
+    def retried(self, n=1):
+        with self.lock:
+            self.retries += n
+
+    def position(self, start):
+        with self.lock:
+            return self.active.get(start, start)
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        done = _merge(self.done + [[s, o] for s, o in self.active.items() if o > s])
+        tmp  = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({**self.head, "done": done}, f)
+        os.replace(tmp, self.path)
+        self.saved = time.time()
+
+
+# ── range helpers ─────────────────────────────────────────────────────────────
+
+class _ShortRead(IOError):
+    pass
+
+# worth another Range request for the rest of the part; HTTP errors are not
+_TRANSIENT = (
+    requests.ConnectionError, requests.Timeout,
+    requests.exceptions.ChunkedEncodingError, _ShortRead,
+)
+
+def _retries(r):
+    # 429/5xx/connect retries urllib3 made before handing us this response
+    retries = getattr(r.raw, "retries", None)
+    return len(getattr(retries, "history", None) or ())
+
+def _content_range_total(r):
+    # "bytes 0-1023/4096" → 4096
+    value = r.headers.get("content-range", "")
+    if not value.startswith("bytes ") or "/" not in value:
+        return None
+    total = value.rsplit("/", 1)[1]
+    return int(total) if total.isdigit() else None
+
+def _plan(gaps, connections):
+    # cut the missing byte ranges into ~`connections` parts of similar size
+    missing = sum(e - s for s, e in gaps)
+    step    = max(MIN_SPLIT_SIZE, -(-missing // max(1, connections)))
+    return [(p, min(p + step, e)) for s, e in gaps for p in range(s, e, step)]
+
+def _stream_range(r, fd, start, stop, pbar, tracker, chunk_size, drop=False, limiter=None):
+    offset, marks = start, [start]
+    for chunk in _chunks(r, chunk_size, limiter):
+        chunk = chunk[: stop - offset]
+        _pwrite(fd, chunk, offset)
+        offset += len(chunk)
+        pbar.update(len(chunk))
+        tracker.advance(start, offset, chunk)
+        if drop and offset - marks[-1] >= DROP_EVERY:
+            _drop_cache(fd, marks[0], offset - marks[0])
+            marks = [marks[-1], offset]
+        if offset >= stop:
+            break
+    if offset != stop:
+        raise _ShortRead(f"short read for bytes {start}-{stop - 1} ({offset - start} received)")
+
+def _fetch_range(url, fd, start, stop, pbar, tracker, chunk_size, timeout, drop=False, limiter=None):
+    # a dropped connection resumes the part from where it stopped
+    for attempt in range(RETRIES + 1):
+        try:
+            headers = {"Range": f"bytes={start}-{stop - 1}"}
+            with http_get(url, headers=headers, timeout=timeout) as r:
+                tracker.retried(_retries(r))
+                r.raise_for_status()
+                if r.status_code != 206:
+                    raise IOError(f"server ignored Range for bytes {start}-{stop - 1}")
+                _stream_range(r, fd, start, stop, pbar, tracker, chunk_size, drop, limiter)
+            return
+        except _TRANSIENT:
+            start = tracker.position(start)
+            if attempt == RETRIES:
+                raise
+            tracker.retried()
+            time.sleep(BACKOFF * 2 ** attempt)
+
+def _open(url, start, etag, timeout):
+    headers = {"Range": f"bytes={start}-"}
+    if etag and not etag.startswith("W/"):
+        headers["If-Range"] = etag                   # changed file → 200, not 206
+    r = http_get(url, headers=headers, timeout=timeout)
+    if r.status_code == 416 and start == 0:          # empty file: nothing to range over
+        r.close()
+        r = http_get(url, timeout=timeout)
+    return r
+
+
+# ── single stream ─────────────────────────────────────────────────────────────
+
+def _stream_whole(r, path, pbar, chunk_size, hasher=None, size=None, drop=False, limiter=None):
+    written, marks = 0, [0]
+    with open(path, "wb") as f:
+        if size:
+            _allocate(f.fileno(), size)
+        for chunk in _chunks(r, chunk_size, limiter):
+            f.write(chunk)
+            if hasher is not None:
+                hasher.update(written, chunk)
+            written += len(chunk)
+            pbar.update(len(chunk))
+            if drop and written - marks[-1] >= DROP_EVERY:
+                f.flush()
+                _drop_cache(f.fileno(), marks[0], written - marks[0])
+                marks = [marks[-1], written]
+        f.truncate(written)                          # preallocated, then cut short
+        if drop:
+            f.flush()
+            _drop_cache(f.fileno(), sync=True)
+    return written
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def fetch_file(url, path, connections=8, resume=True, chunk_size=CHUNK_SIZE, timeout=60, desc=None,
+               checksum=None, drop_cache=DROP_CACHE, stats=None, limiter=None):
+    """
+    Download one file over up to `connections` parallel HTTP Range requests.
+
+    The first request asks for "bytes=N-"; a 206 reply tells us the size and
+    that ranges work, and its body is reused as the first part so no probe
+    request is wasted. The file is preallocated and every part writes at its
+    own offset, so nothing is reassembled afterwards. A 200 reply (Range
+    ignored) or a small file is streamed over that single connection instead.
+
+    Bytes land in `<path>.part`, with `<path>.part.json` recording the ETag,
+    size and finished byte ranges. With resume=True a later call only asks
+    for the missing ranges (If-Range guards against a changed file), even
+    from another mirror `url` when a checksum is given; the .part file is
+    renamed onto `path` once complete, so `path` never holds a truncated
+    download. It is only thrown away when the remote file changed (other
+    size or ETag); an error reply raises and leaves it for the next try.
+
+    With `checksum` (a model_cache.blob_key: LFS sha256 or "git-<sha1>") the
+    bytes are hashed as they arrive and a mismatch raises ChecksumError
+    instead of renaming a corrupt file into place.
+
+    All transfers share one token bucket (set_max_bandwidth) and, with
+    `limiter` (a RateLimiter), the cap of one run. Reads grow from
+    `chunk_size` towards MAX_CHUNK on fast links, and the file's blocks
+    are allocated up front. drop_cache=True evicts the written pages as the
+    download goes, so a multi-GB model doesn't push the page cache of
+    running models out of RAM.
+
+    A `stats` dict is filled with "bytes" (transferred by this call),
+    "ttfb" (seconds to the first response) and "retries" (urllib3 and
+    Range part retries), see download_metrics.
+
+    Returns the number of bytes in the file. Raises on any failure.
+    """
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    desc  = desc or os.path.basename(path)
+    part  = path + PART_SUFFIX
+    state = _load_state(part) if resume else None
+    stats = {} if stats is None else stats
+    stats.update(bytes=0, ttfb=None, retries=0)
+    if state is None:
+        _discard(part)
+
+    if state and not _missing(state["done"], state["size"]):
+        if checksum and not checksum_file(part, checksum):
+            _discard(part)
+            raise ChecksumError(f"checksum mismatch for {desc}")
+        os.replace(part, path)
+        _discard(part)
+        return state["size"]
+
+    # with a checksum the content is pinned by its hash, so a .part begun on
+    # another mirror (other ETag) is continued and the final hash decides
+    start = _missing(state["done"], state["size"])[0][0] if state else 0
+    guard = state.get("etag") if state and not checksum else None
+    t0 = time.perf_counter()
+    r = _open(url, start, guard, timeout)
+    stats["ttfb"], stats["retries"] = time.perf_counter() - t0, _retries(r)
+    if state and r.status_code >= 400 and _content_range_total(r) in (None, state["size"]):
+        r.close()                                    # mirror without the file, 5xx: keep the .part
+        r.raise_for_status()
+    if state and (
+        r.status_code != 206
+        or _content_range_total(r) != state["size"]
+        or (guard and r.headers.get("etag", guard) != guard)
+    ):
+        r.close()                                    # remote file changed → start over
+        _discard(part)
+        state, start = None, 0
+        r = _open(url, 0, None, timeout)
+        stats["retries"] += _retries(r)
+
+    tracker = None
+    try:
+        r.raise_for_status()
+        total = _content_range_total(r)
+
+        if r.status_code != 206 or total is None:
+            size = int(r.headers.get("content-length", 0))
+            plain  = "content-length" in r.headers and "content-encoding" not in r.headers
+            hasher = _StreamingHash(checksum, size) if checksum and plain else None
+            with tqdm(total=size, unit="B", unit_scale=True, desc=desc, leave=False,
+                      disable=not SHOW_PROGRESS) as pbar:
+                total = _stream_whole(r, part, pbar, chunk_size, hasher,
+                                      size if plain else None, drop_cache, limiter)
+            stats["bytes"] = total
+            if hasher is not None:
+                hasher.check(desc)
+            elif checksum and not checksum_file(part, checksum):
+                raise ChecksumError(f"checksum mismatch for {desc}")
+        else:
+            done    = state["done"] if state else []
+            parts   = _plan(_missing(done, total), connections)
+            fd = _open_prealloc(part, total, keep=state is not None)
+            hasher  = _StreamingHash(checksum, total, fd, done) if checksum else None
+            tracker = _RangeTracker(part, url, r.headers.get("etag"), total, done, hasher)
+            try:
+                with tqdm(
+                    total=total, initial=total - sum(e - s for s, e in parts),
+                    unit="B", unit_scale=True, desc=desc, leave=False, disable=not SHOW_PROGRESS,
+                ) as pbar:
+                    # follow redirects once, then hit the final (CDN) URL directly
+                    final_url = r.url
+                    with ThreadPoolExecutor(max_workers=max(1, len(parts) - 1)) as ex:
+                        futures = [
+                            ex.submit(_fetch_range, final_url, fd, s, e, pbar, tracker, chunk_size,
+                                      timeout, drop_cache, limiter)
+                            for s, e in parts[1:]
+                        ]
+                        if parts:
+                            first, stop = parts[0]
+                            try:
+                                _stream_range(r, fd, first, stop, pbar, tracker, chunk_size, drop_cache,
+                                              limiter)
+                            except _TRANSIENT:
+                                r.close()            # its slot first: the retry needs one of its own
+                                _fetch_range(final_url, fd, tracker.position(first), stop,
+                                             pbar, tracker, chunk_size, timeout, drop_cache, limiter)
+                            finally:
+                                r.close()            # free the host slot before waiting
+                        for future in as_completed(futures):
+                            future.result()
+                if hasher is not None:
+                    hasher.check(desc)
+                if drop_cache:
+                    _drop_cache(fd, sync=True)
+            finally:
+                os.close(fd)
+                stats["retries"] += tracker.retries
+            stats["bytes"] = sum(e - s for s, e in parts)
+
+        os.replace(part, path)
+        _discard(part)
+        return total
+    except ChecksumError:
+        _discard(part)                               # corrupt bytes are not worth resuming
+        raise
+    except Exception:
+        if tracker is not None:
+            try: tracker.save()                      # keep what we have for next time
+            except Exception: pass
+        raise
+    finally:
+        r.close()
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from fast_download import fetch_file
+#
+# fetch_file(
+#     "https://huggingface.co/deepdml/faster-whisper-large-v3-turbo-ct2/resolve/main/model.bin",
+#     "./faster-whisper-large-v3-turbo-ct2/model.bin",
+#     connections=16,
+#     resume=True,          # an interrupted run only fetches the missing bytes
+# )
+#
+# On a node shared with live inference:
+#   DOWNLOAD_MAX_BANDWIDTH=50e6 DOWNLOAD_DROP_CACHE=1 python app.py
+# or at runtime:
+#   from fast_download import set_max_bandwidth
+#   set_max_bandwidth(50e6)   # 50 MB/s for all threads together
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import socket
+import threading
+
+LOCK_SUFFIX = ".lock"
+HEARTBEAT   = 5.0                    # seconds between mtime refreshes while a lock is held
+STALE_AFTER = 30.0                   # seconds without a heartbeat before a lock is broken
+POLL        = 0.2                    # seconds between attempts while waiting
+FOLDER_LOCK = ".download"            # folder_lock(): <folder>/.download.lock
+
+
+# ── lock ──────────────────────────────────────────────────────────────────────
+
+class LockTimeout(TimeoutError):
+    """The lock was still held when `timeout` ran out."""
+
+def _alive(pid):
+    if os.name != "posix":
+        return True                                  # Windows: os.kill(pid, 0) would kill it
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class FileLock:
+    """
+    Lock on `path` shared by every process (and thread) on the machine, or
+    on all machines mounting the same folder.
+
+    The holder owns `<path>.lock`, created with O_EXCL and holding its host
+    and pid; a heartbeat thread touches it while the lock is held. A lock
+    left by a crashed downloader is broken: on the same host as soon as its
+    pid is gone, elsewhere once the heartbeat is STALE_AFTER seconds old.
+
+        with FileLock("./model/model.bin"):
+            ...                                      # only one process in here at a time
+    """
+
+    def __init__(self, path, timeout=None, quiet=False):
+        self.path    = os.path.abspath(path) + LOCK_SUFFIX
+        self.timeout = timeout
+        self.quiet   = quiet
+        self.owner   = {"host": socket.gethostname(), "pid": os.getpid(), "thread": None}
+        self._stop   = None
+
+    def _read(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path) as f:
+                return json.load(f), mtime
+        except ValueError:
+            return None, mtime                       # being written, or its writer died doing so
+        except OSError:
+            return None, None
+
+    def _stale(self):
+        """The (owner, mtime) seen if the lock is stale, else None."""
+        owner, mtime = self._read()
+        if mtime is None:
+            return None                              # just released: retry
+        if owner and owner.get("host") == self.owner["host"] and not _alive(owner.get("pid", 0)):
+            return owner, mtime
+        return (owner, mtime) if time.time() - mtime > STALE_AFTER else None
+
+    def _break(self, seen):
+        # move it aside, then make sure it is still the stale lock we judged: another waiter may
+        # have broken that one already and taken the lock afresh, which must stay in place
+        aside = f"{self.path}.{os.getpid()}.{threading.get_ident()}.stale"
+        try:
+            os.replace(self.path, aside)
+        except OSError:
+            return
+        owner, mtime = None, None
+        try:
+            mtime = os.path.getmtime(aside)
+            with open(aside) as f:
+                owner = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if (owner, mtime) != seen:
+            try:
+                os.link(aside, self.path)            # put it back, unless a newer lock exists
+            except FileExistsError:
+                pass
+            except OSError:                          # no hard links here
+                if not os.path.exists(self.path):
+                    os.replace(aside, self.path)
+        try:
+            os.remove(aside)
+        except OSError:
+            pass
+
+    def acquire(self):
+        deadline = None if self.timeout is None else time.time() + self.timeout
+        waiting  = False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.owner["thread"] = threading.get_ident()
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                seen = self._stale()
+                if seen:
+                    if not self.quiet:
+                        print(f"🔓 Breaking stale lock: {self.path}")
+                    self._break(seen)
+                    continue
+                if deadline is not None and time.time() > deadline:
+                    raise LockTimeout(f"lock still held: {self.path}")
+                if not waiting and not self.quiet:
+                    print(f"⏳ Waiting for another download: {os.path.basename(self.path[:-len(LOCK_SUFFIX)])}")
+                waiting = True
+                time.sleep(POLL)
+                continue
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.owner, f)
+            break
+
+        self._stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(self._stop,), daemon=True).start()
+        return self
+
+    def _heartbeat(self, stop):
+        while not stop.wait(HEARTBEAT):
+            try:
+                os.utime(self.path)
+            except OSError:
+                return
+
+    def release(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+        if self._read()[0] == self.owner:            # never remove a lock someone else took over
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def folder_lock(folder, **kwargs):
+    """
+    FileLock on a whole folder. Its lock file is `<folder>/.download.lock`,
+    inside the folder: FileLock(folder) would create `<folder>.lock` in the
+    parent, which may be read-only (or the user's home with folder="./").
+    """
+    return FileLock(os.path.join(folder, FOLDER_LOCK), **kwargs)
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# Every download_model takes a lock on its folder and every file a lock of its
+# own, so N worker processes calling asr.load_model() at once download the
+# model once; the others print "⏳ Waiting ..." and then find every file in place.
+#
+# from file_lock import FileLock, folder_lock
+# with folder_lock("/content/models/IndexTTS-2"):
+#     ...
+# with FileLock("/content/models/IndexTTS-2/model.bin"):
+#     ...
@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import shutil
+import threading
+from fast_download import checksum_file, fetch_file, get_session
+from endpoints import demote, ordered
+from file_lock import FileLock
+
+# One store per machine; every download_folder is filled from it by hardlink.
+CACHE_DIR = os.environ.get(
+    "MODEL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "useful-function")
+)
+BLOB_DIR     = os.path.join(CACHE_DIR, "blobs")
+MANIFEST_DIR = os.path.join(CACHE_DIR, "manifests")
+MANIFEST_TTL = float(os.environ.get("MODEL_MANIFEST_TTL", 3600))   # seconds
+VERIFY_FILE  = os.path.join(CACHE_DIR, "verified.json")
+
+FICLONE = 0x40049409                  # linux/fs.h: reflink ioctl (btrfs, xfs, ...)
+
+
+# ── blob keys ─────────────────────────────────────────────────────────────────
+
+def blob_key(sibling):
+    """
+    Content key for one entry of `api/models/{repo}?blobs=true` siblings.
+
+    LFS files carry their sha256; small git files carry the git blob id
+    (which is also the ETag huggingface.co serves for them). Returns None
+    when the API gave neither, i.e. the file can't be cached by content.
+    """
+    lfs = sibling.get("lfs") or {}
+    if lfs.get("sha256"):
+        return lfs["sha256"]
+    if sibling.get("blobId"):
+        return f"git-{sibling['blobId']}"
+    return None
+
+def blob_path(key):
+    return os.path.join(BLOB_DIR, key[:2], key)
+
+def has_blob(key):
+    return os.path.isfile(blob_path(key))
+
+
+# ── repo manifests ────────────────────────────────────────────────────────────
+
+def _manifest_path(repo_id, revision):
+    return os.path.join(MANIFEST_DIR, f"{repo_id.replace('/', '--')}@{revision}.json")
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+def get_manifest(repo_id, revision="main", ttl=MANIFEST_TTL, offline=False):
+    """
+    File list of a Hugging Face repo, cached on disk.
+
+    Returns {"repo_id", "revision", "sha", "etag", "fetched", "siblings"},
+    where each sibling has "rfilename", "size" and, when known, "blobId" /
+    "lfs" (see blob_key). A manifest younger than `ttl` seconds is used
+    without touching the network; an older one is revalidated with a single
+    conditional request. Endpoints (see endpoints.py) are tried fastest
+    first. With offline=True, or when no endpoint can be reached, the last
+    cached manifest is returned as is.
+    """
+    path   = _manifest_path(repo_id, revision)
+    cached = _load_manifest(path)
+    if cached and (offline or time.time() - cached["fetched"] < ttl):
+        return cached
+    if offline:
+        raise FileNotFoundError(f"no cached manifest for {repo_id}@{revision}")
+
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    error = None
+    for endpoint in ordered():
+        try:
+            r = get_session().get(
+                f"{endpoint}/api/models/{repo_id}/revision/{revision}",
+                params={"blobs": "true"}, headers=headers, timeout=30,
+            )
+            if r.status_code == 304 and cached:
+                cached["fetched"] = time.time()
+                _save_manifest(path, cached)
+                return cached
+            r.raise_for_status()
+            break
+        except Exception as e:
+            error = e
+            demote(endpoint)
+    else:
+        if cached:
+            return cached                                # offline: trust the last listing
+        raise error
+
+    data = r.json()
+    manifest = {
+        "repo_id":  repo_id,
+        "revision": revision,
+        "sha":      data.get("sha"),
+        "etag":     r.headers.get("etag"),
+        "fetched":  time.time(),
+        "siblings": data.get("siblings", []),
+    }
+    _save_manifest(path, manifest)
+    return manifest
+
+
+# ── verification ──────────────────────────────────────────────────────────────
+
+_verified      = None
+_verified_lock = threading.Lock()
+
+def _stat(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+def _verified_db(reload=False):
+    # reload=True merges in what other processes wrote since this one last read it
+    global _verified
+    if _verified is None or reload:
+        try:
+            with open(VERIFY_FILE) as f:
+                on_disk = json.load(f)
+        except Exception:
+            on_disk = {}
+        _verified = {**(_verified or {}), **on_disk}
+    return _verified
+
+def mark_verified(path, key):
+    """Remember that `path`, as it is on disk right now, matches `key`."""
+    entry = [key] + _stat(path)
+    os.makedirs(os.path.dirname(VERIFY_FILE), exist_ok=True)
+    # read-merge-write under a lock, so processes verifying other files keep each other's entries
+    with FileLock(VERIFY_FILE, quiet=True), _verified_lock:
+        db = _verified_db(reload=True)
+        db[os.path.abspath(path)] = entry
+        tmp = f"{VERIFY_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(db, f)
+        os.replace(tmp, VERIFY_FILE)
+
+def verify_file(path, key, fast=True):
+    """
+    True if `path` has the content `key` (see blob_key) names.
+
+    With fast=True a file already verified once and unchanged since (same
+    size, mtime and inode) is trusted without reading it, so checking a
+    3 GB model folder on every start costs a few stat() calls.
+    """
+    if not os.path.isfile(path):
+        return False
+    if fast:
+        entry = [key] + _stat(path)
+        with _verified_lock:
+            # not known here: another process may have verified it since we read the file
+            if _verified_db().get(os.path.abspath(path)) == entry \
+                    or _verified_db(reload=True).get(os.path.abspath(path)) == entry:
+                return True
+    if not checksum_file(path, key):
+        return False
+    mark_verified(path, key)
+    return True
+
+
+# ── materialisation ───────────────────────────────────────────────────────────
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+def materialize(src, dst):
+    """
+    Make `dst` hold the contents of `src` without copying bytes if possible:
+    hardlink, then reflink, then a plain copy. Returns the method used.
+    """
+    parent = os.path.dirname(dst)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return "link"
+
+    tmp = dst + ".tmp"
+    for method, fn in (("link", os.link), ("reflink", _reflink), ("copy", shutil.copyfile)):
+        try:
+            if os.path.lexists(tmp):
+                os.remove(tmp)
+            fn(src, tmp)
+            os.replace(tmp, dst)
+            return method
+        except Exception:
+            continue
+    raise OSError(f"could not materialize {src} → {dst}")
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def fetch_blob(url, key, path, redownload=False, connections=8, fetch=fetch_file, stats=None,
+               limiter=None):
+    """
+    Populate `path` from the blob store, downloading into the store first if
+    the blob isn't there yet. Returns "CACHED" or "DOWNLOADED". `fetch` is
+    the file backend doing the transfer (see downloader.FILE_BACKENDS); it
+    fills `stats` and is paced by `limiter` like fetch_file.
+
+    Files in download folders are hardlinks into the store, so edit them by
+    writing a new file and renaming it over the old one, never in place.
+    A blob is fetched by one process at a time; the others wait and link it.
+    """
+    blob = blob_path(key)
+    with FileLock(blob, quiet=True):
+        if redownload or not verify_file(blob, key):
+            # hashed while downloading; a corrupt blob never enters the store
+            fetch(url, blob, connections=connections, resume=not redownload,
+                  desc=os.path.basename(path), checksum=key, stats=stats, limiter=limiter)
+            mark_verified(blob, key)
+            status = "DOWNLOADED"
+        else:
+            status = "CACHED"
+    materialize(blob, path)
+    mark_verified(path, key)
+    return status
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# get_manifest() replaces the per-call `api/models/{repo}` request in every
+# download_model variant:
+#
+#   from model_cache import get_manifest
+#   manifest = get_manifest("deepdml/faster-whisper-large-v3-turbo-ct2")
+#   files = [s["rfilename"] for s in manifest["siblings"]]
+#
+# The blob store is used by asr / hf_mirror / hf_hub download_model. Point
+# MODEL_CACHE_DIR at a disk shared by all projects, ideally the same
+# filesystem as the download folders so hardlinks work:
+#   import os; os.environ["MODEL_CACHE_DIR"] = "/content/model_cache"
+#   from asr import download_model
+#   download_model("deepdml/faster-whisper-large-v3-turbo-ct2", "./whisper-a")
+#   download_model("deepdml/faster-whisper-large-v3-turbo-ct2", "./whisper-b")  # no network I/O
@@ -0,0 +1,233 @@
+# !pip install faster-whisper==1.1.1
+import os
+import gc
+import time
+import threading
+from contextlib import contextmanager
+import torch
+from faster_whisper import WhisperModel
+from whisper_tune import tuned_config
+
+IDLE_TIMEOUT  = float(os.environ.get("WHISPER_IDLE_TIMEOUT", 600))   # s unused before a model is freed
+MEMORY_BUDGET = float(os.environ.get("WHISPER_MEMORY_BUDGET", 0)) or None   # bytes for all resident models
+WEIGHT_FILES  = (".bin", ".safetensors", ".pt")
+
+
+def default_device():
+    """("cuda", "float16") on a GPU, ("cpu", "int8") otherwise."""
+    if torch.cuda.is_available():
+        return "cuda", "float16"
+    return "cpu", "int8"
+
+def model_options(path, objective="latency"):
+    """
+    (device, compute_type, WhisperModel kwargs) for `path` on this host: the
+    whisper_tune winner for `objective` (compute type, cpu_threads,
+    num_workers) when the host was benchmarked, default_device() otherwise.
+    """
+    device, compute_type = default_device()
+    options = tuned_config(path, device, objective)
+    return device, options.pop("compute_type", compute_type), options
+
+def _estimate(path):
+    # resident size ≈ the weights on disk (CTranslate2 maps them nearly 1:1)
+    if not os.path.isdir(path):
+        return 0
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path) for f in files if f.endswith(WEIGHT_FILES)
+    )
+
+def _load(path, device, compute_type, **kwargs):
+    return WhisperModel(path, device=device, compute_type=compute_type, **kwargs)
+
+
+# ── pool ──────────────────────────────────────────────────────────────────────
+
+class _Entry:
+    def __init__(self, key, model, size):
+        self.key   = key
+        self.model = model
+        self.size  = size
+        self.refs  = 0
+        self.used  = time.time()
+
+class ModelPool:
+    """
+    Keeps Whisper models loaded between calls, keyed by (path, device,
+    compute_type, extra WhisperModel kwargs).
+
+    acquire() hands out the resident model (loading it once, even when many
+    threads ask at the same time) and counts the reference; release() gives
+    it back. A model nobody holds is freed after `idle_timeout` seconds, or
+    earlier when loading another one would exceed `memory_budget` bytes
+    (least recently used first). idle_timeout=0 frees a model as soon as
+    the last user releases it, i.e. the old load-per-call behaviour.
+    """
+
+    def __init__(self, loader=_load, idle_timeout=IDLE_TIMEOUT, memory_budget=MEMORY_BUDGET):
+        self.loader        = loader
+        self.idle_timeout  = idle_timeout
+        self.memory_budget = memory_budget
+        self._entries = {}                           # key → _Entry
+        self._by_id   = {}                           # id(model) → key
+        self._loading = {}                           # key → lock held while it loads
+        self._lock    = threading.Lock()
+        self._reaper  = None
+
+    def _key(self, path, device, compute_type, kwargs):
+        if device is None:
+            device, default_type = default_device()
+            compute_type = compute_type or default_type
+        compute_type = compute_type or ("float16" if device == "cuda" else "int8")
+        return os.path.abspath(path), device, compute_type, tuple(sorted(kwargs.items()))
+
+    def acquire(self, path, device=None, compute_type=None, **kwargs):
+        key = self._key(path, device, compute_type, kwargs)
+        device, compute_type = key[1], key[2]
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refs += 1
+                    entry.used = time.time()
+                    return entry.model
+                loading = self._loading.setdefault(key, threading.Lock())
+            with loading:
+                with self._lock:
+                    if key in self._entries:         # another thread loaded it meanwhile
+                        continue
+                size = _estimate(path)
+                self._make_room(size)
+                start = time.time()
+                model = self.loader(path, device, compute_type, **kwargs)
+                print(f"🧠 Loaded {os.path.basename(key[0])} ({device}/{compute_type}) "
+                      f"in {time.time() - start:.1f}s")
+                with self._lock:
+                    entry = self._entries[key] = _Entry(key, model, size)
+                    self._by_id[id(model)] = key
+                    self._loading.pop(key, None)
+                    entry.refs = 1
+                self._start_reaper()
+                return model
+
+    def release(self, model):
+        with self._lock:
+            key = self._by_id.get(id(model))
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs = max(0, entry.refs - 1)
+            entry.used = time.time()
+            drop = [entry] if entry.refs == 0 and self.idle_timeout == 0 else []
+            for e in drop:
+                self._forget(e)
+        self._free(drop)
+
+    @contextmanager
+    def use(self, path, device=None, compute_type=None, **kwargs):
+        """with pool.use(path) as model: ...  (consume the segments inside the block)"""
+        model = self.acquire(path, device, compute_type, **kwargs)
+        try:
+            yield model
+        finally:
+            self.release(model)
+
+    def discard(self, path, device=None, compute_type=None, **kwargs):
+        """Free that model now if nobody holds it, e.g. before loading a differently configured copy."""
+        key = self._key(path, device, compute_type, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            drop  = [entry] if entry is not None and entry.refs == 0 else []
+            for e in drop:
+                self._forget(e)
+        self._free(drop)
+        return bool(drop)
+
+    def evict_idle(self, older_than=None):
+        """Free every model nobody holds that was last used over `older_than` s ago (0: all)."""
+        older_than = self.idle_timeout if older_than is None else older_than
+        now = time.time()
+        with self._lock:
+            drop = [e for e in self._entries.values() if e.refs == 0 and now - e.used >= older_than]
+            for e in drop:
+                self._forget(e)
+        self._free(drop)
+        return len(drop)
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            return [
+                {"path": e.key[0], "device": e.key[1], "compute_type": e.key[2], "refs": e.refs,
+                 "idle": now - e.used if e.refs == 0 else 0.0, "bytes": e.size}
+                for e in self._entries.values()
+            ]
+
+    # ── internals ──
+
+    def _make_room(self, size):
+        if not self.memory_budget:
+            return
+        with self._lock:
+            used = sum(e.size for e in self._entries.values())
+            drop = []
+            for e in sorted(self._entries.values(), key=lambda e: e.used):
+                if used + size <= self.memory_budget:
+                    break
+                if e.refs == 0:
+                    drop.append(e)
+                    used -= e.size
+            for e in drop:
+                self._forget(e)
+        self._free(drop)
+        if used + size > self.memory_budget:
+            print(f"⚠️ Model memory budget exceeded: {(used + size) / 1e9:.1f} GB "
+                  f"> {self.memory_budget / 1e9:.1f} GB, every resident model is in use")
+
+    def _forget(self, entry):
+        # caller holds self._lock
+        self._entries.pop(entry.key, None)
+        self._by_id.pop(id(entry.model), None)
+
+    def _free(self, entries):
+        if not entries:
+            return
+        for e in entries:
+            print(f"♻️ Unloaded {os.path.basename(e.key[0])} ({e.key[1]}/{e.key[2]})")
+            e.model = None
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _start_reaper(self):
+        with self._lock:
+            if self._reaper is not None or not self.idle_timeout:
+                return
+            self._reaper = threading.Thread(target=self._reap, daemon=True)
+        self._reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(max(1.0, min(self.idle_timeout / 2, 30.0)))
+            self.evict_idle()
+
+
+pool = ModelPool()
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from model_pool import pool
+#
+# with pool.use("./faster-whisper-large-v3-turbo-ct2") as model:   # loaded once, then resident
+#     segments, info = model.transcribe("audio.mp3")
+#     text = " ".join(s.text for s in segments)                  # decode inside the block
+#
+# device, compute_type, options = model_options(path)        # tuned per host, see whisper_tune
+# with pool.use(path, device, compute_type, **options) as model: ...
+#
+# print(pool.stats())
+# pool.evict_idle(0)   # free everything not in use right now
+#
+# Env: WHISPER_IDLE_TIMEOUT=600 (s), WHISPER_MEMORY_BUDGET=6e9 (bytes)
@@ -34,10 +34,11 @@ def remove_noise_high_quality(audio_path,
     # --------------------------
     # Step 1: Prepare VAD input (16kHz mono)
     # --------------------------
+    # from the audio already loaded; asr transcribes the cleaned output, not this input,
+    # so there is nothing to share with it
     wav_vad = torch.mean(orig_audio, dim=0, keepdim=True)  # mono
     if orig_sr != 16000:
-        wav_vad = torchaudio.transforms.Resample(orig_sr, 16000)(wav_vad)
-    wav_vad = wav_vad.to(device)
+        wav_vad = torchaudio.functional.resample(wav_vad, orig_sr, 16000)
 
     # --------------------------
     # Step 2: Load Silero-VAD
@@ -0,0 +1,133 @@
+import numpy as np
+
+MAX_CHARS    = 42                    # characters per cue (one subtitle line)
+MAX_DURATION = 6.0                   # s on screen per cue
+MAX_PAUSE    = 0.8                   # s of silence that always ends a cue
+FILL_GAP     = 0.3                   # s gaps between words closed by stretching the earlier one
+MIN_WORD     = 0.02                  # s a word lasts at least
+SENTENCE_END = (".", "!", "?", "…", "。", "！", "？")
+
+
+# ── word table ────────────────────────────────────────────────────────────────
+
+def word_table(segments):
+    """
+    The words of every segment (TranscriptSegment with `words`, see
+    asr.get_timed_transcript) as parallel arrays: word (object), start, end,
+    probability (float64) and segment (index of the segment it came from).
+    """
+    rows  = [w for seg in segments for w in (seg.words or ())]
+    sizes = np.fromiter((len(seg.words or ()) for seg in segments), dtype=np.int64, count=len(segments))
+    table = np.array(rows, dtype=object).reshape(-1, 4)
+    return {
+        "word":        table[:, 0],
+        "start":       table[:, 1].astype(np.float64),
+        "end":         table[:, 2].astype(np.float64),
+        "probability": table[:, 3].astype(np.float64),
+        "segment":     np.repeat(np.arange(len(segments)), sizes),
+    }
+
+def clean(words, fill_gap=FILL_GAP, min_word=MIN_WORD):
+    """
+    Timings fit for display, over the whole transcript at once: starts never
+    go backwards, every word lasts at least `min_word`, overlaps are cut at
+    the next word's start and gaps up to `fill_gap` are closed by holding
+    the earlier word (no flicker between words of one phrase).
+    """
+    start = np.maximum.accumulate(words["start"])
+    end   = np.maximum(words["end"], start + min_word)
+    if start.size > 1:
+        gap = start[1:] - end[:-1]
+        end[:-1] = np.where(gap <= fill_gap, start[1:], end[:-1])   # closes small gaps, trims overlaps
+    return {**words, "start": start, "end": end}
+
+
+# ── cues ──────────────────────────────────────────────────────────────────────
+
+def cues(words, max_chars=MAX_CHARS, max_duration=MAX_DURATION, max_pause=MAX_PAUSE):
+    """
+    Group words into subtitle cues: {"start", "end", "text"} arrays. A cue
+    ends after a sentence, at a pause over `max_pause`, at a segment
+    boundary; longer phrases are split evenly into cues of about `max_chars`
+    characters / `max_duration` seconds at most. All boundaries come from
+    array operations over the whole transcript, no per-word loop.
+    """
+    n = words["start"].size
+    if n == 0:
+        return {"start": np.zeros(0), "end": np.zeros(0), "text": np.zeros(0, dtype=object)}
+    text  = words["word"]
+    chars = np.char.str_len(text.astype(str))
+
+    # hard breaks: sentence end, pause, new segment
+    hard     = np.ones(n, dtype=bool)
+    prev     = np.char.rstrip(text[:-1].astype(str))
+    hard[1:] = (np.logical_or.reduce([np.char.endswith(prev, p) for p in SENTENCE_END])
+                | (words["start"][1:] - words["end"][:-1] > max_pause)
+                | (words["segment"][1:] != words["segment"][:-1]))
+
+    # soft breaks: a longer phrase is cut into the fewest equal parts that fit the limits
+    first  = np.flatnonzero(hard)
+    phrase = np.cumsum(hard) - 1
+    length = np.add.reduceat(chars, first)
+    span   = np.maximum.reduceat(words["end"], first) - words["start"][first]
+    parts  = np.maximum(np.ceil(np.maximum(length / max_chars, span / max_duration)), 1)
+    total  = np.cumsum(chars)
+    middle = total - chars / 2 - (total - chars)[first][phrase]     # chars before each word's centre
+    part   = np.floor(middle / np.maximum(length, 1)[phrase] * parts[phrase])
+    new     = hard.copy()
+    new[1:] |= part[1:] != part[:-1]
+
+    idx = np.flatnonzero(new)
+    return {
+        "start": words["start"][idx],
+        "end":   np.maximum.reduceat(words["end"], idx),
+        "text":  np.char.strip(np.add.reduceat(text, idx).astype(str)).astype(object),
+    }
+
+
+# ── SRT / WebVTT ──────────────────────────────────────────────────────────────
+
+def _clock(seconds, sep):
+    ms      = np.round(np.asarray(seconds) * 1000).astype(np.int64)
+    h, ms   = np.divmod(ms, 3_600_000)
+    m, ms   = np.divmod(ms, 60_000)
+    s, ms   = np.divmod(ms, 1000)
+    return [f"{a:02d}:{b:02d}:{c:02d}{sep}{d:03d}" for a, b, c, d in zip(h, m, s, ms)]
+
+def to_srt(c):
+    """SubRip text of cues(...)."""
+    start, end = _clock(c["start"], ","), _clock(c["end"], ",")
+    return "".join(f"{i}\n{a} --> {b}\n{t}\n\n"
+                   for i, (a, b, t) in enumerate(zip(start, end, c["text"]), 1))
+
+def to_vtt(c):
+    """WebVTT text of cues(...)."""
+    start, end = _clock(c["start"], "."), _clock(c["end"], ".")
+    return "WEBVTT\n\n" + "".join(f"{a} --> {b}\n{t}\n\n" for a, b, t in zip(start, end, c["text"]))
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def subtitle_cues(segments, **kwargs):
+    """Cues of timed segments (asr.get_timed_transcript): word table → clean → cues."""
+    return cues(clean(word_table(segments)), **kwargs)
+
+def write_subtitles(segments, path, **kwargs):
+    """Write `path` as SRT or WebVTT (by extension) from timed segments; returns the cues."""
+    c = subtitle_cues(segments, **kwargs)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(to_vtt(c) if path.lower().endswith(".vtt") else to_srt(c))
+    print(f"💬 {len(c['text'])} cues → {path}")
+    return c
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# from asr import get_timed_transcript
+# import subtitles
+#
+# segments, lang = get_timed_transcript("/content/video.mp4")     # one decode, word timings
+# subtitles.write_subtitles(segments, "/content/video.srt")
+# subtitles.write_subtitles(segments, "/content/video.vtt", max_chars=32, max_duration=4.0)
+#
+# words = subtitles.clean(subtitles.word_table(segments))        # arrays: word, start, end, probability, segment
+# words["start"][words["probability"] < 0.5]                     # e.g. where to look for errors
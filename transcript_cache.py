@@ -0,0 +1,174 @@
+import os
+import json
+import hashlib
+import threading
+from audio_decode import load_pcm
+from model_cache import CACHE_DIR
+
+TRANSCRIPT_DIR   = os.path.join(CACHE_DIR, "transcripts")
+AUDIO_INDEX      = os.path.join(TRANSCRIPT_DIR, "audio.json")      # path + stat → sample hash
+TRANSCRIPT_LIMIT = int(float(os.environ.get("TRANSCRIPT_CACHE_BYTES", 256 * 1024 * 1024)))
+INDEX_LIMIT      = int(os.environ.get("TRANSCRIPT_INDEX_ENTRIES", 10000))  # paths kept in audio.json
+SAMPLE_RATE      = 16000
+
+
+# ── audio identity ────────────────────────────────────────────────────────────
+
+_index      = None
+_index_lock = threading.Lock()
+
+def _stat(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+def _audio_index():
+    global _index
+    if _index is None:
+        try:
+            with open(AUDIO_INDEX) as f:
+                _index = json.load(f)
+        except Exception:
+            _index = {}
+    return _index
+
+def _prune_index(index, limit=INDEX_LIMIT):
+    """
+    Drop paths changed or gone since they were hashed, then the least
+    recently used ones down to 3/4 of `limit` (so the next few new paths
+    don't prune again). Returns whether anything was dropped.
+    """
+    # caller holds _index_lock
+    before = len(index)
+    for path, entry in list(index.items()):
+        try:
+            if entry[1:] != _stat(path):
+                del index[path]
+        except OSError:
+            del index[path]
+    if len(index) > limit:
+        for path in list(index)[:len(index) - limit * 3 // 4]:
+            del index[path]
+    return len(index) < before
+
+def _save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+def audio_digest(audio_path, index=True):
+    """
+    (sha256 of the decoded 16 kHz samples, samples). The same audio in a
+    different container or under another name gets the same digest. A file
+    hashed before and unchanged since (same size, mtime and inode) is not
+    decoded again: samples is None then. index=False for throwaway paths
+    (uploads): hashed every time and never remembered.
+    """
+    path = os.path.abspath(audio_path)
+    stat = _stat(path)
+    with _index_lock:
+        known = _audio_index().get(path) if index else None
+        if known and known[1:] == stat:
+            _index[path] = _index.pop(path)          # most recently used last (saved with the next write)
+            return known[0], None
+
+    audio  = load_pcm(path, SAMPLE_RATE)
+    digest = hashlib.sha256(audio.data).hexdigest()
+    if not index:
+        return digest, audio
+    with _index_lock:
+        index = _audio_index()
+        index.pop(path, None)
+        index[path] = [digest] + stat
+        if len(index) > INDEX_LIMIT:
+            _prune_index(index)
+        _save_json(AUDIO_INDEX, index)
+    return digest, audio
+
+
+# ── transcript store ──────────────────────────────────────────────────────────
+
+def cache_key(digest, model, compute_type, language, options=None):
+    """Key of one transcript: the audio plus everything that changes the decode."""
+    ident = [digest, model, compute_type, language, options or {}]
+    return hashlib.sha256(json.dumps(ident, sort_keys=True).encode()).hexdigest()
+
+def _entry_path(key):
+    return os.path.join(TRANSCRIPT_DIR, key[:2], key + ".json")
+
+def get(key):
+    """The stored {"text", "language", "segments"} or None; a hit counts as a use for LRU."""
+    path = _entry_path(key)
+    try:
+        with open(path) as f:
+            result = json.load(f)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return result
+
+def put(key, result, limit=TRANSCRIPT_LIMIT):
+    _save_json(_entry_path(key), result)
+    evict(limit)
+
+def evict(limit=TRANSCRIPT_LIMIT):
+    """
+    Delete least recently used transcripts until the store is under `limit`
+    bytes; when any go, the audio index drops its stale paths too.
+    """
+    entries = []
+    for root, _, files in os.walk(TRANSCRIPT_DIR):
+        for name in files:
+            if name.endswith(".json") and root != TRANSCRIPT_DIR:
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, os.path.join(root, name)))
+    total = sum(size for _, size, _ in entries)
+    if total <= limit:
+        return
+    with _index_lock:
+        if _prune_index(_audio_index()):
+            _save_json(AUDIO_INDEX, _index)
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+# ── main function ─────────────────────────────────────────────────────────────
+
+def cached(audio_path, transcribe, model, compute_type, language, options=None, index=True):
+    """
+    Transcript of `audio_path` from the cache, or from transcribe(audio)
+    (stored for next time). transcribe gets the decoded samples when they
+    were needed for the hash, the path otherwise, and must return a JSON-able
+    {"text", "language", "segments"}. A hit loads no model. index: see
+    audio_digest.
+    """
+    digest, audio = audio_digest(audio_path, index)
+    key = cache_key(digest, model, compute_type, language, options)
+    hit = get(key)
+    if hit is not None:
+        return hit
+    result = transcribe(audio if audio is not None else audio_path)
+    put(key, result)
+    return result
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# asr.get_transcript and whisper_code.transcribe_audio go through cached(),
+# so a retried / re-run job returns the stored transcript in milliseconds:
+#
+#   from asr import get_transcript
+#   get_transcript("/content/upload.mp3")      # decode + transcribe, stored
+#   get_transcript("/content/upload.mp3")      # a few stat() + one JSON read
+#
+# Store: $MODEL_CACHE_DIR/transcripts, capped at TRANSCRIPT_CACHE_BYTES (LRU);
+# its audio.json path index at TRANSCRIPT_INDEX_ENTRIES paths (LRU, stale paths first).
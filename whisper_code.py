@@ -8,9 +8,8 @@ whisper_model_path=download_model(
     workers=6,
     use_snapshot=True,  
 )
-import torch
-import gc
-from faster_whisper import WhisperModel
+from model_pool import model_options, pool
+import transcript_cache
 
 LANGUAGE_CODE = {
     'Akan': 'aka', 'Albanian': 'sq', 'Amharic': 'am', 'Arabic': 'ar', 'Armenian': 'hy',
@@ -39,26 +38,21 @@ def get_language_name(code):
             return name
     return None
 def transcribe_audio(audio_path, language=None):
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    compute_type = "float16" if device == "cuda" else "int8"
     lang_code = LANGUAGE_CODE.get(language)
     whisper_path=f"{root_path}/fish-speech-colab/faster-whisper-large-v3-turbo-ct2"
-    model = WhisperModel(
-        whisper_path,
-        device=device,
-        compute_type=compute_type
-    )
-    segments, info = model.transcribe(audio_path, language=lang_code)
-    detected_lang_code = info.language
-    detected_language = get_language_name(detected_lang_code)
-    transcript = " ".join([s.text for s in segments])
+    device, compute_type, options = model_options(whisper_path)   # see whisper_tune
 
-    del model
-    gc.collect()
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
+    def transcribe(audio):
+        # loaded once and kept resident between calls (freed after WHISPER_IDLE_TIMEOUT)
+        with pool.use(whisper_path, device, compute_type, **options) as model:
+            segments, info = model.transcribe(audio, language=lang_code)
+            segments = list(segments)
+        return {"text": " ".join([s.text for s in segments]), "language": get_language_name(info.language),
+                "segments": [{"text": s.text, "start": s.start, "end": s.end} for s in segments]}
 
-    return transcript.strip(),detected_language
+    # same audio + same model/options: the stored transcript, no model load
+    result = transcript_cache.cached(audio_path, transcribe, whisper_path, compute_type, lang_code)
+    return result["text"].strip(), result["language"]
 
 audio_path="audio.mp3"
 transcript,detected_language=transcribe_audio(audio_path, language="English")
@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import time
+import socket
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel
+from audio_decode import load_pcm, peak_rss
+from model_cache import CACHE_DIR
+
+TUNE_FILE       = os.path.join(CACHE_DIR, "whisper_tune.json")
+REFERENCE_AUDIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio", "warning.mp3")
+REFERENCE_SECS  = 60.0               # reference speech per transcription
+CPU_TYPES       = ("int8", "int8_float32", "float32")
+GPU_TYPES       = ("float16", "int8_float16", "int8")
+PROBE_TIMEOUT   = 900                # s one configuration may take before it's skipped
+OBJECTIVES      = {"latency": "rtf", "throughput": "throughput_rtf"}   # → measurement ranked by
+
+
+# ── measurements ──────────────────────────────────────────────────────────────
+
+def host_key():
+    return f"{socket.gethostname()}/{os.cpu_count()}cpu/{ctranslate2.get_cuda_device_count()}gpu"
+
+def _model_name(model_path):
+    return os.path.basename(os.path.normpath(model_path))
+
+def _tunings():
+    try:
+        with open(TUNE_FILE) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def tuned_config(model_path, device, objective="latency"):
+    """
+    WhisperModel kwargs (compute_type, cpu_threads, num_workers) that won on
+    this host for `objective`, or {}: "latency" for one transcription at a
+    time, "throughput" for batches / servers keeping every replica busy.
+    """
+    entry = _tunings().get(host_key(), {}).get(f"{_model_name(model_path)}@{device}", {})
+    best  = entry.get("winners", {}).get(objective)
+    return dict(best) if best else {}
+
+def reference_audio(seconds=REFERENCE_SECS):
+    """The same speech on every host: audio/warning.mp3 repeated, with short pauses, to `seconds`."""
+    clip  = load_pcm(REFERENCE_AUDIO)
+    pause = np.zeros(8000, dtype=np.float32)
+    reps  = int(seconds * 16000 // (clip.size + pause.size)) + 1
+    return np.tile(np.concatenate([clip, pause]), reps)[:int(seconds * 16000)]
+
+def candidates(device, cores=None):
+    """(compute_type, cpu_threads, num_workers) layouts worth measuring on this host."""
+    cores     = cores or os.cpu_count() or 1
+    supported = ctranslate2.get_supported_compute_types(device)
+    types     = [t for t in (GPU_TYPES if device == "cuda" else CPU_TYPES) if t in supported]
+    if device == "cuda":
+        layouts = [(0, 1), (0, 2)]
+    else:
+        layouts = [(cores // w, w) for w in (1, 2, 4, 8) if w <= cores]
+    return [(t, threads, workers) for t in types for threads, workers in layouts]
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def _probe(model_path, device, compute_type, cpu_threads, num_workers, seconds):
+    # runs in a child process, so peak memory belongs to this configuration alone
+    audio = reference_audio(seconds)
+    base  = peak_rss()
+    start = time.perf_counter()
+    model = WhisperModel(model_path, device=device, compute_type=compute_type,
+                         cpu_threads=cpu_threads, num_workers=num_workers)
+    load  = time.perf_counter() - start
+    run   = lambda a: " ".join(s.text for s in model.transcribe(a, beam_size=5)[0])
+    run(audio[:16000 * 5])                           # warm-up
+
+    start = time.perf_counter()
+    run(audio)
+    latency = time.perf_counter() - start
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_workers) as ex:   # one stream per replica
+        list(ex.map(run, [audio] * num_workers))
+    busy = time.perf_counter() - start
+    return {"load": load, "rtf": latency / seconds, "throughput_rtf": busy / (seconds * num_workers),
+            "memory": peak_rss() - base}
+
+def benchmark_compute(model_path, device=None, max_memory=None, seconds=REFERENCE_SECS, configs=None):
+    """
+    Transcribe the reference audio with every candidate compute type and
+    cpu_threads / num_workers layout, each in a fresh process, and remember
+    the best for this host and model per objective (see tuned_config):
+    "latency" by real-time factor of one transcription at a time,
+    "throughput" with every replica busy. Configurations peaking above
+    `max_memory` bytes are not chosen. Returns {config: measurements}.
+    """
+    device  = device or ("cuda" if ctranslate2.get_cuda_device_count() else "cpu")
+    results = {}
+    for compute_type, threads, workers in configs or candidates(device):
+        config = {"compute_type": compute_type, "cpu_threads": threads, "num_workers": workers}
+        args   = json.dumps([os.path.abspath(model_path), device, compute_type, threads, workers, seconds])
+        try:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--probe", args],
+                                 capture_output=True, text=True, timeout=PROBE_TIMEOUT, check=True)
+            m = json.loads(out.stdout.strip().splitlines()[-1])
+        except (subprocess.SubprocessError, ValueError, IndexError) as e:
+            print(f"⚠️ {compute_type} {threads}x{workers}: {getattr(e, 'stderr', None) or e}"[:300])
+            continue
+        results[json.dumps(config, sort_keys=True)] = m
+        print(f"⏱ {compute_type:<13} threads {threads:>3} workers {workers}  RTF {m['rtf']:.3f}  "
+              f"busy RTF {m['throughput_rtf']:.3f}  {m['memory'] / 2**20:7.0f} MiB")
+
+    fits  = {c: m for c, m in results.items() if max_memory is None or m["memory"] <= max_memory}
+    if fits:
+        winners = {
+            objective: json.loads(min(fits, key=lambda c: (fits[c][key], fits[c]["memory"])))
+            for objective, key in OBJECTIVES.items()
+        }
+        db = _tunings()
+        db.setdefault(host_key(), {})[f"{_model_name(model_path)}@{device}"] = {
+            "winners": winners, "measured": time.time(), "results": results,
+        }
+        os.makedirs(os.path.dirname(TUNE_FILE), exist_ok=True)
+        tmp = f"{TUNE_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(db, f)
+        os.replace(tmp, TUNE_FILE)
+        for objective, config in winners.items():
+            print(f"✅ Best for {objective} on {host_key()}: {config}")
+    return results
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--probe"]:
+        print(json.dumps(_probe(*json.loads(sys.argv[2]))))
+    else:
+        benchmark_compute(sys.argv[1] if len(sys.argv) > 1 else "./faster-whisper-large-v3-turbo-ct2")
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+# Once per host (and model), then the winners are picked up: the latency one by
+# asr.get_transcript / whisper_code, the throughput one by transcribe_many / asr_server:
+#   python whisper_tune.py ./faster-whisper-large-v3-turbo-ct2
+#
+# import whisper_tune
+# whisper_tune.benchmark_compute(MODEL_DIR, max_memory=4 * 2**30)
+# whisper_tune.tuned_config(MODEL_DIR, "cpu")                # {"compute_type": "int8", "cpu_threads": 16, "num_workers": 1}
+# whisper_tune.tuned_config(MODEL_DIR, "cpu", "throughput")  # {"compute_type": "int8", "cpu_threads": 4, "num_workers": 4}